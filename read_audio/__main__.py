@@ -1,8 +1,6 @@
 import sys
 import warnings
 from pathlib import Path
-import tempfile
-import shutil
 from typing import Optional
 import click
 from read_audio.helpers.cli import percentage_type
@@ -10,26 +8,28 @@ from read_audio.helpers.cli import percentage_type
 # Suppress pydub's invalid escape sequence warnings
 warnings.filterwarnings("ignore", category=SyntaxWarning, module="pydub.utils")
 
-from read_audio.download import youtube
-from read_audio.transcribe import whisper
+from read_audio import pipeline
 from read_audio.constants import (
     DEFAULT_WHISPER_MODEL,
     DEFAULT_LLAMA_MODEL,
     DEFAULT_LANGUAGE,
+    AUTO_LANGUAGE,
     MODEL_MAPPING,
-    DEFAULT_CONDENSE_PROMPT,
     DEFAULT_CONDENSE_PERCENTAGE,
+    ROUTING_DEADLINE,
+    ROUTING_HEDGE_DELAY,
 )
-from read_audio.logger import logger
-from .providers import get_provider
+from .providers import get_provider, get_routing_provider
 
 
 @click.command()
 @click.option(
     "--mode",
+    "modes",
     type=click.Choice(["summary", "condense"]),
-    default="summary",
-    help="Processing mode: summary (200-250 words) or condense (configurable length)",
+    multiple=True,
+    default=["summary"],
+    help="Processing mode: summary (200-250 words) or condense (configurable length). Repeat to produce several outputs",
 )
 @click.option(
     "--url",
@@ -66,6 +66,25 @@ from .providers import get_provider
     default="ollama",
     help="AI provider to use for summarization",
 )
+@click.option(
+    "--fallback-provider",
+    "fallback_providers",
+    type=click.Choice(["openai", "anthropic", "ollama"]),
+    multiple=True,
+    help="Provider to hedge to when --provider is slow or failing (repeatable)",
+)
+@click.option(
+    "--hedge-delay",
+    type=click.FloatRange(min=0),
+    default=ROUTING_HEDGE_DELAY,
+    help=f"Seconds before a hedged request is sent to a fallback provider (default: {ROUTING_HEDGE_DELAY:g})",
+)
+@click.option(
+    "--deadline",
+    type=click.FloatRange(min=0, min_open=True),
+    default=ROUTING_DEADLINE,
+    help=f"Seconds to wait for any provider to answer (default: {ROUTING_DEADLINE:g})",
+)
 # FIXME: Handle provider/model mapping correctly.
 @click.option(
     "--model",
@@ -75,7 +94,12 @@ from .providers import get_provider
 @click.option(
     "--language",
     default=DEFAULT_LANGUAGE,
-    help="Language of the video",
+    help=f"Language of the video, or '{AUTO_LANGUAGE}' to detect it from short samples first",
+)
+@click.option(
+    "--auto-whisper-model",
+    is_flag=True,
+    help="With --language auto, switch between the English-only (.en) and multilingual variant of --whisper-model for the detected language; the model size is not changed. No effect with MLX-Whisper on macOS",
 )
 @click.option(
     "--show-transcript",
@@ -94,24 +118,42 @@ from .providers import get_provider
 )
 @click.option(
     "--condense-percentage",
+    "condense_percentages",
     type=percentage_type,
-    default=DEFAULT_CONDENSE_PERCENTAGE,
-    help="Percentage of original length for condensed output (1-100%)",
+    multiple=True,
+    default=[DEFAULT_CONDENSE_PERCENTAGE],
+    help="Percentage of original length for condensed output (1-100%). Repeat for several condensed outputs",
+)
+@click.option(
+    "--incremental",
+    is_flag=True,
+    help="Store per-section results next to the output and only reprocess changed or new sections on rerun",
+)
+@click.option(
+    "--no-split",
+    is_flag=True,
+    help="Fail when the transcript does not fit the model context instead of splitting it",
 )
 def main(
-    mode: str,
+    modes: tuple[str, ...],
     url: Optional[str],
     file: Optional[Path],
     transcript: Optional[Path],
     output: Path,
     whisper_model: str,
     provider: str,
+    fallback_providers: tuple[str, ...],
+    hedge_delay: float,
+    deadline: float,
     model: str,
     language: str,
+    auto_whisper_model: bool,
     show_transcript: bool,
     show_processed_text: bool,
     use_cloud_whisper: bool,
-    condense_percentage: int,
+    condense_percentages: tuple[int, ...],
+    incremental: bool,
+    no_split: bool,
 ) -> None:
     """Generate summaries or condensed versions of video content"""
 
@@ -125,78 +167,35 @@ def main(
     if model == DEFAULT_LLAMA_MODEL:  # If using the default model
         model = MODEL_MAPPING[provider]  # Use the provider's default model
 
-    # Create temporary directory for processing
-    with tempfile.TemporaryDirectory() as temp_dir:
-        temp_path = Path(temp_dir)
-        audio_path: Optional[Path] = None
-
-        # Handle input sources
-        if transcript:
-            transcript_path = transcript
-        else:
-            if url:
-                logger.info("Downloading audio...")
-                audio_path = youtube.download_audio(
-                    url, temp_path, use_cloud=use_cloud_whisper
-                )
-            elif file:
-                logger.info("Processing local video...")
-                audio_path = temp_path / file.name
-                shutil.copy2(str(file), str(audio_path))
-
-            if not audio_path:
-                raise click.UsageError("Failed to get audio file")
-
-            logger.info("Transcribing audio...")
-            transcript_path = whisper.transcribe(
-                audio_path=audio_path,
-                output_dir=temp_path,
-                language=language,
-                model_name=whisper_model,
-                use_cloud=use_cloud_whisper,
-            )
-
-            # Save transcript to output directory
-            transcript_output_path = output / f"{audio_path.stem}_transcript.txt"
-            shutil.copy2(transcript_path, transcript_output_path)
-            logger.info(f"Transcript saved to: {transcript_output_path}")
-
-        # Generate output
+    if fallback_providers:
+        ai_provider = get_routing_provider(
+            [provider, *fallback_providers],
+            model,
+            deadline=deadline,
+            hedge_delay=hedge_delay,
+        )
+    else:
         ai_provider = get_provider(provider, model)
-        with open(transcript_path, "r", encoding="utf-8") as f:
-            transcript_text = f.read()
-
-            if show_transcript:
-                logger.info("\nTranscript:")
-                logger.info(transcript_text)
-
-        # Update the condense prompt with the specified percentage if in condense mode
-        if mode == "condense":
-            input_length = len(transcript_text)
-            target_length = int(input_length * condense_percentage / 100)
-            formatted_prompt = DEFAULT_CONDENSE_PROMPT.format(
-                percentage=condense_percentage,
-                input_length=input_length,
-                target_length=target_length,
-            )
-            logger.info(f"Using condense prompt: {formatted_prompt}")
-            result = ai_provider.process_text(
-                transcript_text, mode, prompt=formatted_prompt
-            )
-        else:
-            result = ai_provider.process_text(transcript_text, mode)
-
-        # Prepare output
-        suffix = "summary" if mode == "summary" else "condensed"
-        output_file = output / f"{transcript_path.stem}_{suffix}.txt"
-        with open(output_file, "w", encoding="utf-8") as f:
-            f.write(result)
-
-            if show_processed_text:
-                logger.info(f"\n{suffix.capitalize()}:")
-                logger.info(result)
 
-        logger.info(f"{suffix.capitalize()} written to {output_file}")
+    pipeline.run(
+        ai_provider=ai_provider,
+        output=output,
+        provider=provider,
+        model=model,
+        modes=modes,
+        url=url,
+        file=file,
+        transcript=transcript,
+        whisper_model=whisper_model,
+        language=language,
+        use_cloud_whisper=use_cloud_whisper,
+        auto_whisper_model=auto_whisper_model,
+        condense_percentages=condense_percentages,
+        show_transcript=show_transcript,
+        show_processed_text=show_processed_text,
+        split=not no_split,
+        incremental=incremental,
+    )
 
 
 if __name__ == "__main__":
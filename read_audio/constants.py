@@ -22,7 +22,16 @@ DEFAULT_WHISPER_CLOUD_MODEL = "whisper-1"
 DEFAULT_MLX_WHISPER_MODEL_REPO = "mlx-community/whisper-turbo"
 DEFAULT_LANGUAGE = "en"
 
+# Language probe, used when the language is "auto". Windows start at these
+# fractions of the audio duration.
+AUTO_LANGUAGE = "auto"
+PROBE_WHISPER_MODEL = "tiny"
+PROBE_WINDOW_SECONDS = 15.0
+PROBE_OFFSETS = (0.0, 0.5)
+PROBE_MIN_CONFIDENCE = 0.5  # Below this Whisper detects the language itself
+
 OLLAMA_HOST = "http://localhost:11434"
+OLLAMA_TIMEOUT = (5, 600)  # Connect and read timeouts in seconds
 
 DEFAULT_LLAMA_MODEL = "llama3.1:8b"
 DEFAULT_ANTRHOPIC_MODEL = "claude-3-5-sonnet-20241022"
@@ -33,3 +42,94 @@ MODEL_MAPPING = {
     "anthropic": DEFAULT_ANTRHOPIC_MODEL,
     "openai": DEFAULT_OPENAI_MODEL,
 }
+
+# Model limits used by the preflight: context window and maximum output in
+# tokens, USD per million input/output tokens, and rough prefill/decode
+# throughput in tokens per second for latency estimates. Models not listed
+# fall back to their provider's entry.
+PROVIDER_LIMITS = {
+    "openai": {
+        "context": 128000,
+        "max_output": 16384,
+        "input_cost": 2.5,
+        "output_cost": 10.0,
+        "prefill_tps": 5000,
+        "decode_tps": 80,
+    },
+    "anthropic": {
+        "context": 200000,
+        "max_output": 8192,
+        "input_cost": 3.0,
+        "output_cost": 15.0,
+        "prefill_tps": 5000,
+        "decode_tps": 60,
+    },
+    # Ollama allocates memory for the whole num_ctx, so stay well below what
+    # the models support unless configured otherwise
+    "ollama": {
+        "context": 32768,
+        "max_output": 8192,
+        "input_cost": 0.0,
+        "output_cost": 0.0,
+        "prefill_tps": 500,
+        "decode_tps": 25,
+    },
+}
+MODEL_LIMITS = {
+    DEFAULT_OPENAI_MODEL: {"context": 128000, "max_output": 16384},
+    "gpt-4o-mini": {
+        "context": 128000,
+        "max_output": 16384,
+        "input_cost": 0.15,
+        "output_cost": 0.6,
+    },
+    DEFAULT_ANTRHOPIC_MODEL: {"context": 200000, "max_output": 8192},
+    DEFAULT_LLAMA_MODEL: {"context": 32768},
+}
+
+# Token estimates when the model's tokenizer is not installed. CJK characters
+# are mostly one token or more each in the llama3, o200k and Claude tokenizers,
+# and estimates are padded by ESTIMATE_MARGIN on top.
+CHARS_PER_TOKEN = 4.0
+NON_ASCII_CHARS_PER_TOKEN = 2.0
+CJK_CHARS_PER_TOKEN = 1.0
+ESTIMATE_MARGIN = 1.1
+SUMMARY_OUTPUT_TOKENS = 1024
+CONDENSE_OUTPUT_MARGIN = 1.3  # Headroom over the requested condense length
+CONTEXT_MARGIN_TOKENS = 256
+CONTEXT_SIZE_STEP = 2048  # Ollama num_ctx is rounded up to a multiple of this
+MAX_CONCURRENT_CHUNKS = 4  # Chunks of a split transcript processed at once
+
+# Job server configuration
+SERVER_HOST = "127.0.0.1"
+SERVER_PORT = 8765
+SERVER_WORKERS = 2
+SERVER_MAX_QUEUE = 32
+SERVER_MAX_FINISHED_JOBS = 1000
+# Subdirectory of the server output shared by all jobs for section stores
+# and language probe caches
+SERVER_CACHE_DIR = "cache"
+
+# Cloud request scheduling. Limits are requests and tokens per minute, keyed by
+# provider or "provider/model"; None means unlimited.
+RATE_LIMITS = {
+    "openai": {"rpm": 500, "tpm": 30000},
+    "openai/whisper-1": {"rpm": 50, "tpm": None},
+    "anthropic": {"rpm": 50, "tpm": 40000},
+}
+DEFAULT_PRIORITY = 10  # Lower values are scheduled first
+SCHEDULER_MAX_RETRIES = 5
+SCHEDULER_BASE_DELAY = 1.0
+SCHEDULER_MAX_DELAY = 60.0
+
+# Provider routing. The hedge delay is how long the first backend gets before
+# the same request is also sent to the next one.
+ROUTING_DEADLINE = 600.0
+ROUTING_HEDGE_DELAY = 30.0
+ROUTING_LATENCY_BUCKETS = (0.5, 1, 2, 5, 10, 20, 30, 60, 120, 300, 600)
+ROUTING_LATENCY_WINDOW = 100  # Recent latencies kept per backend for ranking
+
+# Incremental processing. Sections aim for this many tokens; past half of it a
+# section ends at a sentence whose hash is divisible by the divisor.
+INCREMENTAL_SECTION_TOKENS = 2000
+INCREMENTAL_BOUNDARY_DIVISOR = 16
@@ -1,3 +1,6 @@
+from pathlib import Path
+
+
 class OllamaError(Exception):
     """Base exception for Ollama-related errors."""
 
@@ -8,3 +11,42 @@ class ProcessedTextError(Exception):
     """Base exception for processed text errors."""
 
     pass
+
+
+class QueueFullError(Exception):
+    """Raised when a job is submitted while the queue is at its maximum depth."""
+
+    pass
+
+
+class JobValidationError(Exception):
+    """Raised when a submitted job specification is invalid."""
+
+    pass
+
+
+class RateLimitError(Exception):
+    """Raised when a cloud API keeps rate limiting after all retries."""
+
+    pass
+
+
+class PreflightError(Exception):
+    """Raised when a transcript cannot be processed within the model's limits."""
+
+    pass
+
+
+class PartialOutputError(Exception):
+    """Raised when some of a job's outputs were written and others failed."""
+
+    def __init__(self, message: str, output_files: list[Path], errors: dict[str, str]):
+        super().__init__(message)
+        self.output_files = output_files
+        self.errors = errors
+
+
+class LanguageProbeError(Exception):
+    """Raised when the spoken language cannot be probed from the audio."""
+
+    pass
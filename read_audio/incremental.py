@@ -0,0 +1,136 @@
+"""Content-hashed transcript sections and their stored partial results."""
+
+import hashlib
+import json
+import os
+import tempfile
+from pathlib import Path
+from typing import Any, Optional
+
+from read_audio.constants import (
+    INCREMENTAL_SECTION_TOKENS,
+    INCREMENTAL_BOUNDARY_DIVISOR,
+)
+from read_audio.logger import logger
+from read_audio.preflight import estimate_tokens, split_sentences
+
+
+def _digest(text: str) -> str:
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+
+def _normalize(text: str) -> str:
+    return " ".join(text.split())
+
+
+def split_sections(
+    text: str, target_tokens: int = INCREMENTAL_SECTION_TOKENS
+) -> list[str]:
+    """
+    Split text into sections whose boundaries depend only on nearby content.
+
+    After at least half the target size, a section ends at the first sentence
+    whose hash is divisible by INCREMENTAL_BOUNDARY_DIVISOR, and it always ends
+    by twice the target. Editing a sentence therefore changes only its own
+    section (or a neighbour when the edit moves a boundary), and appending
+    text leaves every earlier section intact.
+    """
+    sections: list[str] = []
+    current: list[str] = []
+    current_tokens = 0
+
+    for sentence in split_sentences(_normalize(text)):
+        current.append(sentence)
+        current_tokens += estimate_tokens(sentence)
+
+        at_boundary = int(_digest(sentence.strip())[:8], 16) % INCREMENTAL_BOUNDARY_DIVISOR == 0
+        if (current_tokens >= target_tokens // 2 and at_boundary) or (
+            current_tokens >= target_tokens * 2
+        ):
+            sections.append("".join(current).strip())
+            current, current_tokens = [], 0
+
+    if current:
+        sections.append("".join(current).strip())
+    return [section for section in sections if section]
+
+
+class SectionStore:
+    """
+    Partial results per section hash, persisted as JSON next to the output.
+
+    The store is tied to a signature (mode, prompt, model); results produced
+    under a different signature are discarded on load.
+    """
+
+    def __init__(self, path: Path, signature: dict[str, Any]):
+        self.path = path
+        self.signature = signature
+        self.sections: dict[str, str] = {}
+        self.final: dict[str, str] = {}
+        self._used: set[str] = set()
+        self._load()
+
+    @staticmethod
+    def key(section: str) -> str:
+        return _digest(section)
+
+    def _load(self) -> None:
+        if not self.path.exists():
+            return
+        try:
+            with open(self.path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+        except (OSError, ValueError) as e:
+            logger.warning(f"Ignoring unreadable section store {self.path}: {e}")
+            return
+
+        if data.get("signature") != self.signature:
+            logger.info("Settings changed since the last run, reprocessing all sections")
+            return
+        self.sections = data.get("sections", {})
+        self.final = data.get("final", {})
+
+    def get(self, key: str) -> Optional[str]:
+        self._used.add(key)
+        return self.sections.get(key)
+
+    def put(self, key: str, partial: str) -> None:
+        self._used.add(key)
+        self.sections[key] = partial
+
+    def get_final(self, key: str) -> Optional[str]:
+        if self.final.get("key") == key:
+            return self.final.get("text")
+        return None
+
+    def put_final(self, key: str, text: str) -> None:
+        self.final = {"key": key, "text": text}
+
+    def save(self) -> None:
+        """
+        Write the store, dropping sections that no longer occur in the transcript.
+
+        The JSON goes to a temporary file that then replaces the store, so an
+        interrupted write leaves the previous store intact.
+        """
+        sections = {k: v for k, v in self.sections.items() if k in self._used}
+        fd, temp_path = tempfile.mkstemp(
+            dir=self.path.parent, prefix=f".{self.path.name}.", suffix=".tmp"
+        )
+        try:
+            with os.fdopen(fd, "w", encoding="utf-8") as f:
+                json.dump(
+                    {
+                        "signature": self.signature,
+                        "sections": sections,
+                        "final": self.final,
+                    },
+                    f,
+                    ensure_ascii=False,
+                    indent=2,
+                )
+            os.replace(temp_path, self.path)
+        except BaseException:
+            os.unlink(temp_path)
+            raise
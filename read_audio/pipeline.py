@@ -0,0 +1,438 @@
+"""Processing pipeline shared by the command line and the job server."""
+
+import contextvars
+import shutil
+import tempfile
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from pathlib import Path
+from typing import Callable, Optional, Sequence
+
+from read_audio import preflight
+from read_audio.download import youtube
+from read_audio.transcribe import language as language_probe
+from read_audio.transcribe import whisper
+from read_audio.constants import (
+    DEFAULT_WHISPER_MODEL,
+    DEFAULT_MLX_WHISPER_MODEL_REPO,
+    DEFAULT_LANGUAGE,
+    AUTO_LANGUAGE,
+    PROBE_MIN_CONFIDENCE,
+    DEFAULT_SUMMARY_PROMPT,
+    DEFAULT_CONDENSE_PROMPT,
+    DEFAULT_CONDENSE_PERCENTAGE,
+    MODEL_MAPPING,
+    MAX_CONCURRENT_CHUNKS,
+)
+from read_audio.errors import LanguageProbeError, PartialOutputError, PreflightError
+from read_audio.incremental import SectionStore, split_sections
+from read_audio.logger import logger
+from read_audio.providers import AIProvider, RoutingProvider
+
+# Stages reported through the progress callback, in execution order
+STAGES = ("download", "probe", "transcribe", "process")
+
+ProgressCallback = Callable[[str, str], None]
+
+
+def _no_progress(stage: str, state: str) -> None:
+    pass
+
+
+def plan_outputs(
+    modes: Sequence[str], condense_percentages: Sequence[int]
+) -> list[tuple[str, Optional[int], str]]:
+    """
+    Expand the requested modes into (mode, percentage, suffix) outputs.
+
+    A single condense percentage keeps the plain "condensed" suffix; with
+    several, each output is suffixed with its percentage.
+    """
+    outputs: list[tuple[str, Optional[int], str]] = []
+    for mode in dict.fromkeys(modes):
+        if mode == "summary":
+            outputs.append((mode, None, "summary"))
+        elif mode == "condense":
+            percentages = list(dict.fromkeys(condense_percentages))
+            for percentage in percentages:
+                suffix = "condensed" if len(percentages) == 1 else f"condensed_{percentage}"
+                outputs.append((mode, percentage, suffix))
+        else:
+            raise ValueError(f"Unknown mode: {mode}")
+    return outputs
+
+
+def _condense_prompt(text: str, condense_percentage: int) -> str:
+    input_length = len(text)
+    target_length = int(input_length * condense_percentage / 100)
+    return DEFAULT_CONDENSE_PROMPT.format(
+        percentage=condense_percentage,
+        input_length=input_length,
+        target_length=target_length,
+    )
+
+
+def _map_concurrently(fn: Callable[[str], str], items: list[str]) -> list[str]:
+    """Apply fn to each item in parallel threads, keeping order and context."""
+    with ThreadPoolExecutor(
+        max_workers=min(len(items), MAX_CONCURRENT_CHUNKS)
+    ) as executor:
+        futures = [
+            executor.submit(contextvars.copy_context().run, fn, item) for item in items
+        ]
+        return [future.result() for future in futures]
+
+
+def _fallbacks(
+    ai_provider: AIProvider, provider: str, model: str
+) -> list[tuple[str, str]]:
+    """Other (provider, model) pairs a routing provider may send a request to."""
+    if not isinstance(ai_provider, RoutingProvider):
+        return []
+    return [target for target in ai_provider.targets() if target != (provider, model)]
+
+
+def _process(
+    ai_provider: AIProvider,
+    transcript_text: str,
+    mode: str,
+    condense_percentage: Optional[int],
+    provider: str,
+    model: str,
+    split: bool = True,
+) -> str:
+    # Update the condense prompt with the specified percentage if in condense mode
+    if mode == "condense":
+        prompt = _condense_prompt(transcript_text, condense_percentage)
+        output_ratio = condense_percentage / 100
+    else:
+        prompt = None
+        output_ratio = None
+
+    plan = preflight.plan(
+        transcript_text,
+        prompt or DEFAULT_SUMMARY_PROMPT,
+        provider,
+        model,
+        output_ratio=output_ratio,
+        fallbacks=_fallbacks(ai_provider, provider, model),
+    )
+    logger.info(f"Preflight: {plan.describe()}")
+
+    if plan.fits:
+        if prompt:
+            logger.info(f"Using condense prompt: {prompt}")
+        return ai_provider.process_text(
+            transcript_text,
+            mode,
+            prompt=prompt,
+            max_tokens=plan.max_output_tokens,
+            context_size=plan.context_size,
+        )
+
+    if not split:
+        raise PreflightError(
+            f"Transcript needs {plan.input_tokens} tokens, which does not fit "
+            f"{plan.provider}/{plan.model} ({plan.context_window} token context)"
+        )
+
+    logger.info(f"Splitting transcript into {len(plan.chunks)} chunks")
+    partials = _map_concurrently(
+        lambda chunk: _process(
+            ai_provider, chunk, mode, condense_percentage, provider, model
+        ),
+        plan.chunks,
+    )
+
+    # Condensed chunks keep their proportions, so they are joined in order;
+    # partial summaries are summarized once more
+    if mode == "condense":
+        return "\n\n".join(partials)
+    return _process(
+        ai_provider, "\n\n".join(partials), mode, None, provider, model, split
+    )
+
+
+def _process_incremental(
+    ai_provider: AIProvider,
+    transcript_text: str,
+    mode: str,
+    condense_percentage: Optional[int],
+    provider: str,
+    model: str,
+    split: bool,
+    store_path: Path,
+) -> str:
+    """Process only the sections not already in the store, then recombine."""
+    store = SectionStore(
+        store_path,
+        signature={
+            "mode": mode,
+            "condense_percentage": condense_percentage,
+            "provider": provider,
+            "model": model,
+            "prompt": SectionStore.key(
+                DEFAULT_CONDENSE_PROMPT if mode == "condense" else DEFAULT_SUMMARY_PROMPT
+            ),
+        },
+    )
+    sections = split_sections(transcript_text)
+    keys = [SectionStore.key(section) for section in sections]
+    missing = {
+        key: section for key, section in zip(keys, sections) if store.get(key) is None
+    }
+    logger.info(
+        f"Incremental: {len(sections) - len(missing)} of {len(sections)} sections "
+        f"unchanged, processing {len(missing)}"
+    )
+
+    def process_section(key: str) -> str:
+        partial = _process(
+            ai_provider, missing[key], mode, condense_percentage, provider, model, split
+        )
+        store.put(key, partial)
+        return partial
+
+    try:
+        if missing:
+            _map_concurrently(process_section, list(missing))
+        partials = [store.get(key) for key in keys]
+
+        # Condensed sections keep their proportions, so they are joined in
+        # order; partial summaries are summarized once more
+        combined = "\n\n".join(partials)
+        if mode == "condense" or len(partials) == 1:
+            return combined
+
+        final_key = SectionStore.key("".join(keys))
+        result = store.get_final(final_key)
+        if result is None:
+            result = _process(
+                ai_provider, combined, mode, None, provider, model, split
+            )
+            store.put_final(final_key, result)
+        return result
+    finally:
+        store.save()
+
+
+def run(
+    ai_provider: AIProvider,
+    output: Path,
+    provider: str,
+    model: Optional[str] = None,
+    modes: Sequence[str] = ("summary",),
+    url: Optional[str] = None,
+    file: Optional[Path] = None,
+    transcript: Optional[Path] = None,
+    whisper_model: str = DEFAULT_WHISPER_MODEL,
+    language: Optional[str] = DEFAULT_LANGUAGE,
+    use_cloud_whisper: bool = False,
+    auto_whisper_model: bool = False,
+    condense_percentages: Sequence[int] = (DEFAULT_CONDENSE_PERCENTAGE,),
+    show_transcript: bool = False,
+    show_processed_text: bool = False,
+    split: bool = True,
+    incremental: bool = False,
+    cache_dir: Optional[Path] = None,
+    progress: Optional[ProgressCallback] = None,
+) -> list[Path]:
+    """
+    Run a single job from input source to processed text on disk.
+
+    The transcript is produced once and every requested output is generated
+    from it concurrently.
+
+    Args:
+        ai_provider: Provider used for summary or condense processing
+        provider, model: Name and model behind ai_provider, used to size
+            requests before they are sent
+        output: Directory for the transcript and processed text
+        modes: Processing modes, any of "summary" and "condense"
+        condense_percentages: Target lengths, one condensed output each
+        url, file, transcript: Input source, exactly one must be set
+        language: Language code, None for Whisper's own detection, or
+            "auto" to probe a few short windows before transcribing
+        auto_whisper_model: Pick the English-only or multilingual variant
+            of whisper_model from the probed language; the model size is
+            never changed, and MLX-Whisper on macOS ignores it
+        split: Split transcripts that do not fit the model context into
+            chunks, instead of raising PreflightError
+        incremental: Keep per-section results in <stem>_<suffix>.sections.json
+            and only send changed or new sections to the provider on rerun
+        cache_dir: Directory for the section stores and the language probe
+            cache, defaults to output
+        progress: Called with (stage, state) as each stage in STAGES
+            becomes "running", "done" or "skipped", and with
+            ("process:<suffix>", state) as each output finishes
+
+    Returns:
+        Paths to the processed text files
+
+    Raises:
+        PartialOutputError: When some outputs were written and others failed,
+            with the paths of those written and the error of each failed one
+    """
+    if sum(bool(x) for x in [url, file, transcript]) != 1:
+        raise ValueError("Exactly one of url, file, or transcript must be provided")
+
+    outputs = plan_outputs(modes, condense_percentages)
+    if not outputs:
+        raise ValueError("At least one mode must be requested")
+
+    progress = progress or _no_progress
+    model = model or MODEL_MAPPING[provider]
+    cache_dir = cache_dir or output
+
+    # Create temporary directory for processing
+    with tempfile.TemporaryDirectory() as temp_dir:
+        temp_path = Path(temp_dir)
+        audio_path: Optional[Path] = None
+
+        # Handle input sources
+        if transcript:
+            progress("download", "skipped")
+            progress("probe", "skipped")
+            progress("transcribe", "skipped")
+            transcript_path = transcript
+        else:
+            progress("download", "running")
+            if url:
+                logger.info("Downloading audio...")
+                audio_path = youtube.download_audio(
+                    url, temp_path, use_cloud=use_cloud_whisper
+                )
+            elif file:
+                logger.info("Processing local video...")
+                audio_path = temp_path / file.name
+                shutil.copy2(str(file), str(audio_path))
+
+            if not audio_path:
+                raise RuntimeError("Failed to get audio file")
+            progress("download", "done")
+
+            if language == AUTO_LANGUAGE:
+                progress("probe", "running")
+                try:
+                    detected, confidence = language_probe.probe_language(
+                        audio_path,
+                        cache_path=cache_dir / f"{audio_path.stem}_language.json",
+                    )
+                except LanguageProbeError as e:
+                    logger.warning(f"{e}, leaving detection to Whisper")
+                    detected, confidence = None, 0.0
+                else:
+                    logger.info(
+                        f"Detected language: {detected} ({confidence:.0%} confidence)"
+                    )
+
+                if detected and confidence >= PROBE_MIN_CONFIDENCE:
+                    language = detected
+                    if auto_whisper_model and whisper.uses_mlx(use_cloud_whisper):
+                        logger.warning(
+                            "Not switching the Whisper model: MLX-Whisper always "
+                            f"uses {DEFAULT_MLX_WHISPER_MODEL_REPO}"
+                        )
+                    elif auto_whisper_model and not use_cloud_whisper:
+                        whisper_model = language_probe.whisper_model_for(
+                            language, whisper_model
+                        )
+                        logger.info(f"Using Whisper model: {whisper_model}")
+                else:
+                    if detected:
+                        logger.info("Low confidence, leaving detection to Whisper")
+                    language = None
+                progress("probe", "done")
+            else:
+                progress("probe", "skipped")
+
+            progress("transcribe", "running")
+            logger.info("Transcribing audio...")
+            transcript_path = whisper.transcribe(
+                audio_path=audio_path,
+                output_dir=temp_path,
+                language=language,
+                model_name=whisper_model,
+                use_cloud=use_cloud_whisper,
+            )
+
+            # Save transcript to output directory
+            transcript_output_path = output / f"{audio_path.stem}_transcript.txt"
+            shutil.copy2(transcript_path, transcript_output_path)
+            logger.info(f"Transcript saved to: {transcript_output_path}")
+            progress("transcribe", "done")
+
+        # Generate outputs
+        progress("process", "running")
+        with open(transcript_path, "r", encoding="utf-8") as f:
+            transcript_text = f.read()
+
+            if show_transcript:
+                logger.info("\nTranscript:")
+                logger.info(transcript_text)
+
+        def process_output(
+            mode: str, percentage: Optional[int], suffix: str
+        ) -> str:
+            if incremental:
+                return _process_incremental(
+                    ai_provider,
+                    transcript_text,
+                    mode,
+                    percentage,
+                    provider,
+                    model,
+                    split,
+                    store_path=cache_dir
+                    / f"{transcript_path.stem}_{suffix}.sections.json",
+                )
+            return _process(
+                ai_provider, transcript_text, mode, percentage, provider, model, split
+            )
+
+        output_files = []
+        errors: dict[str, Exception] = {}
+        with ThreadPoolExecutor(max_workers=len(outputs)) as executor:
+            futures = {
+                # Copy the context so scheduler priority follows each call
+                executor.submit(
+                    contextvars.copy_context().run,
+                    process_output,
+                    mode,
+                    percentage,
+                    suffix,
+                ): suffix
+                for mode, percentage, suffix in outputs
+            }
+            for future in as_completed(futures):
+                suffix = futures[future]
+                try:
+                    result = future.result()
+                except Exception as e:
+                    logger.error(f"Failed to produce {suffix}: {e}")
+                    progress(f"process:{suffix}", "failed")
+                    errors[suffix] = e
+                    continue
+
+                output_file = output / f"{transcript_path.stem}_{suffix}.txt"
+                with open(output_file, "w", encoding="utf-8") as f:
+                    f.write(result)
+
+                    if show_processed_text:
+                        logger.info(f"\n{suffix.capitalize()}:")
+                        logger.info(result)
+
+                logger.info(f"{suffix.capitalize()} written to {output_file}")
+                output_files.append(output_file)
+                progress(f"process:{suffix}", "done")
+
+        if errors and not output_files:
+            raise next(iter(errors.values()))
+        if errors:
+            raise PartialOutputError(
+                f"Failed to produce {', '.join(sorted(errors))}",
+                output_files=output_files,
+                errors={suffix: str(e) for suffix, e in errors.items()},
+            )
+        progress("process", "done")
+
+    return output_files
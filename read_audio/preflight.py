@@ -0,0 +1,264 @@
+"""Token-aware checks run before a transcript is sent to a model."""
+
+import math
+import re
+from dataclasses import dataclass, field
+from functools import lru_cache
+from typing import Callable, Optional, Sequence
+
+from read_audio.constants import (
+    CHARS_PER_TOKEN,
+    NON_ASCII_CHARS_PER_TOKEN,
+    CJK_CHARS_PER_TOKEN,
+    ESTIMATE_MARGIN,
+    CONTEXT_MARGIN_TOKENS,
+    CONTEXT_SIZE_STEP,
+    SUMMARY_OUTPUT_TOKENS,
+    CONDENSE_OUTPUT_MARGIN,
+    MODEL_LIMITS,
+    PROVIDER_LIMITS,
+)
+from read_audio.errors import PreflightError
+from read_audio.logger import logger
+
+# Fixed allowance on top of the proportional condense output
+_OUTPUT_OVERHEAD_TOKENS = 64
+
+# Sentence ends: Latin punctuation once followed by whitespace (which stays
+# with the sentence), CJK punctuation immediately, as CJK text has no spaces
+_SENTENCE_END = re.compile(r"(?<=[.!?…]\s)|(?<=[。！？])")
+
+# Han, kana, Hangul and their punctuation and full-width forms
+_CJK_CHAR = re.compile(
+    r"[\u3000-\u30ff\u3400-\u4dbf\u4e00-\u9fff\uac00-\ud7af\uf900-\ufaff\uff00-\uffef]"
+)
+
+# Position after each run of whitespace
+_WORD_END = re.compile(r"(?<=\s)(?=\S)")
+
+
+@lru_cache(maxsize=None)
+def _tiktoken_encoder(model: str) -> Optional[Callable[[str], list[int]]]:
+    try:
+        import tiktoken  # type: ignore
+    except ImportError:
+        return None
+
+    try:
+        try:
+            encoding = tiktoken.encoding_for_model(model)
+        except KeyError:
+            encoding = tiktoken.get_encoding("o200k_base")
+    except Exception as e:
+        # Encodings are downloaded on first use, which fails offline
+        logger.warning(f"tiktoken unavailable for {model}, estimating tokens: {e}")
+        return None
+    return encoding.encode
+
+
+def estimate_tokens(text: str) -> int:
+    """
+    Conservative token estimate for when the model's tokenizer is not available.
+
+    Meant to over- rather than undercount, so a chunk planned to fit the
+    context window is not truncated by the model.
+    """
+    ascii_chars = sum(1 for c in text if c.isascii())
+    cjk_chars = len(_CJK_CHAR.findall(text))
+    other_chars = len(text) - ascii_chars - cjk_chars
+    return max(
+        1,
+        math.ceil(
+            (
+                ascii_chars / CHARS_PER_TOKEN
+                + cjk_chars / CJK_CHARS_PER_TOKEN
+                + other_chars / NON_ASCII_CHARS_PER_TOKEN
+            )
+            * ESTIMATE_MARGIN
+        ),
+    )
+
+
+def count_tokens(text: str, provider: str, model: str) -> int:
+    """Count tokens with the model's tokenizer when installed, else estimate."""
+    if provider == "openai":
+        encode = _tiktoken_encoder(model)
+        if encode is not None:
+            return len(encode(text))
+    return estimate_tokens(text)
+
+
+def model_limits(provider: str, model: str) -> dict:
+    return {**PROVIDER_LIMITS[provider], **MODEL_LIMITS.get(model, {})}
+
+
+def split_sentences(text: str) -> list[str]:
+    """Split text into sentences, keeping whitespace so "".join() restores it."""
+    return [sentence for sentence in _SENTENCE_END.split(text) if sentence]
+
+
+def _pieces(
+    text: str, max_tokens: int, count: Callable[[str], int]
+) -> list[tuple[str, int]]:
+    """Cut text at whitespace, or every few characters when it has none."""
+    tokens = count(text)
+    if tokens <= max_tokens:
+        return [(text, tokens)]
+
+    words = _WORD_END.split(text)
+    if len(words) == 1:
+        step = max(1, len(text) * max_tokens // tokens)
+        words = [text[i : i + step] for i in range(0, len(text), step)]
+    return [piece for word in words for piece in _pieces(word, max_tokens, count)]
+
+
+def split_text(
+    text: str, max_tokens: int, count: Callable[[str], int] = estimate_tokens
+) -> list[str]:
+    """
+    Split text at sentence boundaries into chunks of at most `max_tokens`.
+
+    A sentence longer than that is cut at word boundaries, and a word (or an
+    unpunctuated run of CJK text) at a character count.
+    """
+    chunks: list[str] = []
+    current: list[str] = []
+    current_tokens = 0
+
+    for sentence in split_sentences(text):
+        for piece, tokens in _pieces(sentence, max_tokens, count):
+            if current and current_tokens + tokens > max_tokens:
+                chunks.append("".join(current).strip())
+                current, current_tokens = [], 0
+            current.append(piece)
+            current_tokens += tokens
+
+    if current:
+        chunks.append("".join(current).strip())
+    return [chunk for chunk in chunks if chunk]
+
+
+@dataclass
+class Plan:
+    """Token budget and predictions for processing one text with one model."""
+
+    provider: str
+    model: str
+    input_tokens: int
+    context_window: int
+    max_output_tokens: int
+    context_size: int
+    chunks: list[str] = field(default_factory=list)
+    estimated_seconds: float = 0.0
+    estimated_cost: float = 0.0
+
+    @property
+    def fits(self) -> bool:
+        return len(self.chunks) == 1
+
+    def describe(self) -> str:
+        return (
+            f"{self.provider}/{self.model}: {self.input_tokens} input tokens, "
+            f"context {self.context_window}, up to {self.max_output_tokens} output tokens, "
+            f"{len(self.chunks)} call(s), ~{self.estimated_seconds:.0f}s, "
+            f"~${self.estimated_cost:.4f}"
+        )
+
+
+def plan(
+    text: str,
+    prompt: str,
+    provider: str,
+    model: str,
+    output_ratio: Optional[float] = None,
+    fallbacks: Sequence[tuple[str, str]] = (),
+) -> Plan:
+    """
+    Size a request against the model's context window and output limit.
+
+    Args:
+        text: Transcript text to process
+        prompt: System prompt sent with the text
+        provider, model: Target model
+        output_ratio: Expected output length as a fraction of the input
+            (condense mode); None for a fixed-size summary
+        fallbacks: Other (provider, model) pairs the same request may be
+            sent to. The plan is sized for the smallest context window and
+            output limit among all of them, and tokens are counted with
+            whichever tokenizer counts the most.
+
+    Returns:
+        Plan with output token limit, context size to request, and the text
+        split into chunks that each fit (a single chunk when it all fits)
+    """
+    targets = [(provider, model), *fallbacks]
+    limits = model_limits(provider, model)
+    context_window = min(model_limits(*target)["context"] for target in targets)
+    max_output = min(model_limits(*target)["max_output"] for target in targets)
+
+    def count(value: str) -> int:
+        return max(count_tokens(value, *target) for target in targets)
+
+    text_tokens = count(text)
+    prompt_tokens = count(prompt)
+    available = context_window - prompt_tokens - CONTEXT_MARGIN_TOKENS
+
+    if output_ratio is None:
+        output_tokens = min(SUMMARY_OUTPUT_TOKENS, max_output)
+        max_chunk_tokens = available - output_tokens
+    else:
+        ratio = output_ratio * CONDENSE_OUTPUT_MARGIN
+        output_tokens = min(
+            max_output, math.ceil(text_tokens * ratio) + _OUTPUT_OVERHEAD_TOKENS
+        )
+        max_chunk_tokens = int(
+            min(
+                (available - _OUTPUT_OVERHEAD_TOKENS) / (1 + ratio),
+                (max_output - _OUTPUT_OVERHEAD_TOKENS) / ratio,
+            )
+        )
+
+    if max_chunk_tokens <= 0:
+        raise PreflightError(f"Prompt alone does not fit the {model} context window")
+
+    if text_tokens <= max_chunk_tokens:
+        chunks = [text]
+    else:
+        chunks = split_text(text, max_chunk_tokens, count)
+        oversized = [c for c in chunks if count(c) > max_chunk_tokens]
+        if oversized:
+            raise PreflightError(
+                f"{len(oversized)} of {len(chunks)} chunks still exceed "
+                f"{max_chunk_tokens} tokens after splitting"
+            )
+        if output_ratio is not None:
+            output_tokens = min(
+                max_output,
+                math.ceil(max_chunk_tokens * ratio) + _OUTPUT_OVERHEAD_TOKENS,
+            )
+
+    largest_call = prompt_tokens + min(text_tokens, max_chunk_tokens) + output_tokens
+    context_size = min(
+        context_window,
+        math.ceil((largest_call + CONTEXT_MARGIN_TOKENS) / CONTEXT_SIZE_STEP)
+        * CONTEXT_SIZE_STEP,
+    )
+
+    total_input = text_tokens + prompt_tokens * len(chunks)
+    total_output = output_tokens * len(chunks)
+    return Plan(
+        provider=provider,
+        model=model,
+        input_tokens=text_tokens + prompt_tokens,
+        context_window=context_window,
+        max_output_tokens=output_tokens,
+        context_size=context_size,
+        chunks=chunks,
+        estimated_seconds=(
+            total_input / limits["prefill_tps"] + total_output / limits["decode_tps"]
+        ),
+        estimated_cost=(
+            total_input * limits["input_cost"] + total_output * limits["output_cost"]
+        )
+        / 1_000_000,
+    )
@@ -2,11 +2,16 @@ from .protocol import AIProvider
 from .openai import OpenAIProvider
 from .anthropic import AnthropicProvider
 from .ollama import OllamaProvider
+from .routing import RoutingProvider
 from read_audio.constants import (
     DEFAULT_LLAMA_MODEL,
     DEFAULT_OPENAI_MODEL,
     DEFAULT_ANTRHOPIC_MODEL,
+    ROUTING_DEADLINE,
+    ROUTING_HEDGE_DELAY,
 )
+from read_audio.errors import ProcessedTextError
+from read_audio.logger import logger
 
 
 def get_provider(provider: str, model: str | None = None) -> AIProvider:
@@ -25,10 +30,36 @@ def get_provider(provider: str, model: str | None = None) -> AIProvider:
     return providers[provider](model)
 
 
+def get_routing_provider(
+    providers: list[str],
+    model: str | None = None,
+    deadline: float = ROUTING_DEADLINE,
+    hedge_delay: float = ROUTING_HEDGE_DELAY,
+) -> AIProvider:
+    """Route across providers; `model` applies to the first, the rest use their defaults"""
+    backends: dict[str, AIProvider] = {}
+    for i, name in enumerate(dict.fromkeys(providers)):
+        try:
+            backends[name] = get_provider(name, model if i == 0 else None)
+        except ValueError:
+            raise
+        except Exception as e:
+            logger.warning(f"Skipping provider {name}: {e}")
+
+    if not backends:
+        raise ProcessedTextError(f"None of the providers could be started: {providers}")
+    if len(backends) == 1:
+        return next(iter(backends.values()))
+
+    return RoutingProvider(backends, deadline=deadline, hedge_delay=hedge_delay)
+
+
 __all__ = [
     "AIProvider",
     "OpenAIProvider",
     "AnthropicProvider",
     "OllamaProvider",
+    "RoutingProvider",
     "get_provider",
+    "get_routing_provider",
 ]
@@ -2,7 +2,9 @@ import logging
 from anthropic import Anthropic
 from typing import Literal, Optional
 from .protocol import AIProvider
-from read_audio.errors import ProcessedTextError
+from read_audio.errors import ProcessedTextError, RateLimitError
+from read_audio.preflight import count_tokens
+from read_audio.scheduler import scheduler
 from read_audio.constants import (
     DEFAULT_ANTRHOPIC_MODEL,
     DEFAULT_SUMMARY_PROMPT,
@@ -11,13 +13,23 @@ from read_audio.constants import (
 
 logger = logging.getLogger(__name__)
 
+DEFAULT_MAX_TOKENS = 4096
+
 
 class AnthropicProvider(AIProvider):
     def __init__(self, model: str = DEFAULT_ANTRHOPIC_MODEL):
-        self.client = Anthropic()  # type: ignore
+        # Retries are handled by the shared scheduler
+        self.client = Anthropic(max_retries=0)  # type: ignore
         self.model = model
 
-    def process_text(self, text: str, mode: Literal["summary", "condense"], prompt: Optional[str] = None) -> str:
+    def process_text(
+        self,
+        text: str,
+        mode: Literal["summary", "condense"],
+        prompt: Optional[str] = None,
+        max_tokens: Optional[int] = None,
+        context_size: Optional[int] = None,
+    ) -> str:
         if not text:
             raise ProcessedTextError("Empty text provided for processing")
 
@@ -26,16 +38,21 @@ class AnthropicProvider(AIProvider):
         )
 
         try:
-            response = self.client.messages.create(
-                model=self.model,
-                max_tokens=4096,
-                messages=[
-                    {
-                        "role": "user",
-                        "content": text,
-                    }
-                ],
-                system=system_prompt,
+            response = scheduler.call(
+                "anthropic",
+                self.model,
+                lambda: self.client.messages.create(
+                    model=self.model,
+                    max_tokens=max_tokens or DEFAULT_MAX_TOKENS,
+                    messages=[
+                        {
+                            "role": "user",
+                            "content": text,
+                        }
+                    ],
+                    system=system_prompt,
+                ),
+                tokens=count_tokens(system_prompt + text, "anthropic", self.model),
             )
 
             if not response.content:
@@ -47,8 +64,11 @@ class AnthropicProvider(AIProvider):
 
             return result
 
+        except RateLimitError:
+            # Still rate limited after the scheduler's retries
+            raise
         except Exception as e:
-            raise ProcessedTextError(f"Anthropic processing failed: {str(e)}")
+            raise ProcessedTextError(f"Anthropic processing failed: {str(e)}") from e
 
     def summarize(self, text: str) -> str:
         return self.process_text(text, "summary")
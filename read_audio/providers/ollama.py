@@ -8,6 +8,7 @@ from read_audio.constants import (
     DEFAULT_SUMMARY_PROMPT,
     DEFAULT_CONDENSE_PROMPT,
     OLLAMA_HOST,
+    OLLAMA_TIMEOUT,
 )
 from .protocol import AIProvider
 from read_audio.errors import ProcessedTextError
@@ -34,7 +35,14 @@ class OllamaProvider(AIProvider):
                 "Ollama service is not running. Please start it with 'ollama serve'"
             ) from e
 
-    def process_text(self, text: str, mode: Literal["summary", "condense"], prompt: Optional[str] = None) -> str:
+    def process_text(
+        self,
+        text: str,
+        mode: Literal["summary", "condense"],
+        prompt: Optional[str] = None,
+        max_tokens: Optional[int] = None,
+        context_size: Optional[int] = None,
+    ) -> str:
         if not text:
             raise ProcessedTextError("Empty text provided for processing")
 
@@ -52,11 +60,18 @@ class OllamaProvider(AIProvider):
             "stream": False,
         }
 
-        if self.max_tokens:
-            request_body["options"] = {"num_predict": self.max_tokens}
+        options = {}
+        if max_tokens or self.max_tokens:
+            options["num_predict"] = max_tokens or self.max_tokens
+        if context_size:
+            options["num_ctx"] = context_size
+        if options:
+            request_body["options"] = options
 
         try:
-            response = requests.post(f"{self.host}/api/generate", json=request_body)
+            response = requests.post(
+                f"{self.host}/api/generate", json=request_body, timeout=OLLAMA_TIMEOUT
+            )
             response.raise_for_status()
             result = response.json()["response"]
 
@@ -2,7 +2,9 @@ import logging
 from openai import OpenAI
 from typing import Literal, Optional
 from .protocol import AIProvider
-from read_audio.errors import ProcessedTextError
+from read_audio.errors import ProcessedTextError, RateLimitError
+from read_audio.preflight import count_tokens
+from read_audio.scheduler import scheduler
 from read_audio.constants import (
     DEFAULT_OPENAI_MODEL,
     DEFAULT_SUMMARY_PROMPT,
@@ -14,10 +16,18 @@ logger = logging.getLogger(__name__)
 
 class OpenAIProvider(AIProvider):
     def __init__(self, model: str = DEFAULT_OPENAI_MODEL):
-        self.client = OpenAI()
+        # Retries are handled by the shared scheduler
+        self.client = OpenAI(max_retries=0)
         self.model = model
 
-    def process_text(self, text: str, mode: Literal["summary", "condense"], prompt: Optional[str] = None) -> str:
+    def process_text(
+        self,
+        text: str,
+        mode: Literal["summary", "condense"],
+        prompt: Optional[str] = None,
+        max_tokens: Optional[int] = None,
+        context_size: Optional[int] = None,
+    ) -> str:
         if not text:
             raise ProcessedTextError("Empty text provided for processing")
 
@@ -26,19 +36,26 @@ class OpenAIProvider(AIProvider):
         )
 
         try:
-            response = self.client.chat.completions.create(
-                model=self.model,
-                messages=[
-                    {
-                        "role": "system",
-                        "content": system_prompt,
-                    },
-                    {
-                        "role": "user",
-                        "content": text,
-                    },
-                ],
-                temperature=0.7,
+            response = scheduler.call(
+                "openai",
+                self.model,
+                lambda: self.client.chat.completions.create(
+                    model=self.model,
+                    messages=[
+                        {
+                            "role": "system",
+                            "content": system_prompt,
+                        },
+                        {
+                            "role": "user",
+                            "content": text,
+                        },
+                    ],
+                    temperature=0.7,
+                    **({"max_tokens": max_tokens} if max_tokens else {}),
+                ),
+                tokens=count_tokens(system_prompt + text, "openai", self.model)
+                + (max_tokens or 0),
             )
 
             if not response.choices:
@@ -50,8 +67,11 @@ class OpenAIProvider(AIProvider):
 
             return result
 
+        except RateLimitError:
+            # Still rate limited after the scheduler's retries
+            raise
         except Exception as e:
-            raise ProcessedTextError(f"OpenAI processing failed: {str(e)}")
+            raise ProcessedTextError(f"OpenAI processing failed: {str(e)}") from e
 
     def summarize(self, text: str) -> str:
         return self.process_text(text, "summary")
@@ -4,8 +4,20 @@ from typing import Protocol, Literal, Optional
 class AIProvider(Protocol):
     """Protocol for AI providers that can generate summaries"""
 
-    def process_text(self, text: str, mode: Literal["summary", "condense"], prompt: Optional[str] = None) -> str:
-        """Process text in either summary or condense mode with optional custom prompt"""
+    def process_text(
+        self,
+        text: str,
+        mode: Literal["summary", "condense"],
+        prompt: Optional[str] = None,
+        max_tokens: Optional[int] = None,
+        context_size: Optional[int] = None,
+    ) -> str:
+        """
+        Process text in either summary or condense mode with optional custom prompt.
+
+        max_tokens limits the output; context_size is the context window to
+        allocate, for providers where it is configurable.
+        """
         pass
 
     def summarize(self, text: str) -> str:
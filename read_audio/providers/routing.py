@@ -0,0 +1,240 @@
+import bisect
+import contextvars
+import logging
+import math
+import threading
+import time
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from typing import Literal, Optional
+
+from .protocol import AIProvider
+from read_audio.errors import ProcessedTextError
+from read_audio.constants import (
+    ROUTING_DEADLINE,
+    ROUTING_HEDGE_DELAY,
+    ROUTING_LATENCY_BUCKETS,
+    ROUTING_LATENCY_WINDOW,
+)
+
+logger = logging.getLogger(__name__)
+
+
+class LatencyHistogram:
+    """
+    Bucketed latency samples and failure count for one backend.
+
+    The buckets are for reporting; ranking uses the most recent measured
+    latencies, as a bucket's upper bound can be far above the real latency.
+    """
+
+    def __init__(
+        self,
+        buckets: tuple[float, ...] = ROUTING_LATENCY_BUCKETS,
+        window: int = ROUTING_LATENCY_WINDOW,
+    ):
+        self.buckets = buckets
+        self.counts = [0] * (len(buckets) + 1)
+        self.failures = 0
+        self.recent: deque[float] = deque(maxlen=window)
+        self._lock = threading.Lock()
+
+    @property
+    def successes(self) -> int:
+        return sum(self.counts)
+
+    def record(self, seconds: float) -> None:
+        with self._lock:
+            self.counts[bisect.bisect_left(self.buckets, seconds)] += 1
+            self.recent.append(seconds)
+
+    def record_failure(self) -> None:
+        with self._lock:
+            self.failures += 1
+
+    def quantile(self, q: float) -> Optional[float]:
+        """Upper bound of the bucket holding the q-th quantile, None without samples."""
+        with self._lock:
+            total = sum(self.counts)
+            if not total:
+                return None
+            seen = 0
+            for i, count in enumerate(self.counts):
+                seen += count
+                if seen >= q * total:
+                    return self.buckets[i] if i < len(self.buckets) else float("inf")
+        return float("inf")
+
+    def score(self) -> Optional[float]:
+        """Measured p90 of recent latencies inflated by the failure rate; lower is better."""
+        with self._lock:
+            recent = sorted(self.recent)
+            successes = sum(self.counts)
+            failures = self.failures
+        if not recent:
+            return float("inf") if failures else None
+        p90 = recent[math.ceil(0.9 * len(recent)) - 1]
+        return p90 * (successes + failures) / successes
+
+    def to_dict(self) -> dict:
+        return {
+            "p50": self.quantile(0.5),
+            "p90": self.quantile(0.9),
+            "p99": self.quantile(0.99),
+            "successes": self.successes,
+            "failures": self.failures,
+        }
+
+
+class RoutingProvider(AIProvider):
+    """
+    Provider that routes each call across several backends.
+
+    The call goes to the backend with the best latency record first. If it
+    has not answered after `hedge_delay` seconds (or fails), the next backend
+    is tried in parallel. The first good answer wins and the remaining calls
+    are cancelled or abandoned. No answer within `deadline` is an error.
+    """
+
+    def __init__(
+        self,
+        backends: dict[str, AIProvider],
+        deadline: float = ROUTING_DEADLINE,
+        hedge_delay: float = ROUTING_HEDGE_DELAY,
+    ):
+        if not backends:
+            raise ValueError("RoutingProvider needs at least one backend")
+        self.backends = backends
+        self.deadline = deadline
+        self.hedge_delay = hedge_delay
+        self.histograms = {name: LatencyHistogram() for name in backends}
+
+    def ranked(self) -> list[str]:
+        """
+        Backend names, fastest first.
+
+        Backends without samples are scored at `hedge_delay`, so they stay
+        behind any backend that reliably answers before a hedge would be sent,
+        and keep their configured order among themselves.
+        """
+
+        def score(name: str) -> float:
+            value = self.histograms[name].score()
+            return self.hedge_delay if value is None else value
+
+        return sorted(self.backends, key=score)
+
+    def targets(self) -> list[tuple[str, str]]:
+        """(provider, model) of every backend, in configured order."""
+        return [(name, backend.model) for name, backend in self.backends.items()]
+
+    def process_text(
+        self,
+        text: str,
+        mode: Literal["summary", "condense"],
+        prompt: Optional[str] = None,
+        max_tokens: Optional[int] = None,
+        context_size: Optional[int] = None,
+    ) -> str:
+        if not text:
+            raise ProcessedTextError("Empty text provided for processing")
+
+        order = self.ranked()
+        executor = ThreadPoolExecutor(
+            max_workers=len(order), thread_name_prefix="read-audio-route"
+        )
+        pending: dict[Future, str] = {}
+        errors: list[str] = []
+        start = time.monotonic()
+        last_launch = start
+
+        def launch(name: str) -> None:
+            nonlocal last_launch
+            if pending:
+                logger.info(f"Hedging request to {name}")
+            last_launch = time.monotonic()
+            # Copy the context so scheduler priority follows the call
+            context = contextvars.copy_context()
+            future = executor.submit(
+                context.run,
+                self._call,
+                name,
+                text,
+                mode,
+                prompt,
+                max_tokens,
+                context_size,
+            )
+            pending[future] = name
+
+        try:
+            launch(order.pop(0))
+            while pending or order:
+                now = time.monotonic()
+                remaining = self.deadline - (now - start)
+                if remaining <= 0:
+                    break
+
+                if not pending:
+                    launch(order.pop(0))
+                    continue
+
+                timeout = remaining
+                if order:
+                    timeout = min(timeout, max(0.0, last_launch + self.hedge_delay - now))
+
+                done, _ = wait(pending, timeout=timeout, return_when=FIRST_COMPLETED)
+                for future in done:
+                    name = pending.pop(future)
+                    try:
+                        return future.result()
+                    except Exception as e:
+                        logger.warning(f"Backend {name} failed: {e}")
+                        errors.append(f"{name}: {e}")
+
+                hedge_due = time.monotonic() >= last_launch + self.hedge_delay
+                if not done and order and hedge_due:
+                    launch(order.pop(0))
+
+            if pending:
+                raise ProcessedTextError(
+                    f"No backend answered within {self.deadline:g}s "
+                    f"(still waiting on {sorted(pending.values())})"
+                )
+            raise ProcessedTextError(f"All backends failed: {'; '.join(errors)}")
+
+        finally:
+            for future in pending:
+                future.cancel()
+            executor.shutdown(wait=False, cancel_futures=True)
+
+    def _call(
+        self,
+        name: str,
+        text: str,
+        mode: Literal["summary", "condense"],
+        prompt: Optional[str],
+        max_tokens: Optional[int],
+        context_size: Optional[int],
+    ) -> str:
+        # Latency is recorded even for abandoned calls so slow backends keep their score
+        start = time.monotonic()
+        try:
+            result = self.backends[name].process_text(
+                text,
+                mode,
+                prompt=prompt,
+                max_tokens=max_tokens,
+                context_size=context_size,
+            )
+        except Exception:
+            self.histograms[name].record_failure()
+            raise
+        self.histograms[name].record(time.monotonic() - start)
+        return result
+
+    def summarize(self, text: str) -> str:
+        return self.process_text(text, "summary")
+
+    def condense(self, text: str) -> str:
+        return self.process_text(text, "condense")
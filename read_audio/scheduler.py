@@ -0,0 +1,255 @@
+"""Rate-limit-aware scheduling for cloud API calls."""
+
+import email.utils
+import heapq
+import itertools
+import random
+import threading
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Any, Callable, Iterator, Optional, TypeVar
+
+from read_audio.constants import (
+    RATE_LIMITS,
+    DEFAULT_PRIORITY,
+    SCHEDULER_MAX_RETRIES,
+    SCHEDULER_BASE_DELAY,
+    SCHEDULER_MAX_DELAY,
+)
+from read_audio.errors import RateLimitError
+from read_audio.logger import logger
+
+T = TypeVar("T")
+
+# Status codes worth retrying: rate limits, timeouts and transient server errors
+# (529 is Anthropic's "overloaded")
+RETRYABLE_STATUS_CODES = {408, 409, 429, 500, 502, 503, 504, 529}
+
+# SDK errors raised without a response (connection failures, timeouts). The
+# clients run with max_retries=0, so these are retried here instead.
+RETRYABLE_ERROR_NAMES = {"APIConnectionError", "APITimeoutError"}
+
+_priority: ContextVar[int] = ContextVar("priority", default=DEFAULT_PRIORITY)
+
+
+class TokenBucket:
+    """Token bucket refilled continuously at a per-minute rate."""
+
+    def __init__(self, per_minute: int):
+        self.capacity = float(per_minute)
+        self.rate = per_minute / 60.0
+        self.available = self.capacity
+        self.updated = time.monotonic()
+
+    def _refill(self, now: float) -> None:
+        self.available = min(
+            self.capacity, self.available + (now - self.updated) * self.rate
+        )
+        self.updated = now
+
+    def wait_time(self, amount: float, now: float) -> float:
+        """Seconds until `amount` can be consumed (requests above capacity are capped)."""
+        self._refill(now)
+        missing = min(amount, self.capacity) - self.available
+        return max(0.0, missing / self.rate)
+
+    def consume(self, amount: float, now: float) -> None:
+        self._refill(now)
+        self.available -= min(amount, self.capacity)
+
+
+class RateLimiter:
+    """Request and token limits for one provider/model, granted in priority order."""
+
+    def __init__(self, rpm: Optional[int] = None, tpm: Optional[int] = None):
+        self.requests = TokenBucket(rpm) if rpm else None
+        self.tokens = TokenBucket(tpm) if tpm else None
+        self._blocked_until = 0.0
+        self._waiters: list[tuple[int, int]] = []
+        self._counter = itertools.count()
+        self._cond = threading.Condition()
+
+    def acquire(self, tokens: int = 0, priority: int = DEFAULT_PRIORITY) -> None:
+        """Block until a request using `tokens` tokens may be sent."""
+        with self._cond:
+            ticket = (priority, next(self._counter))
+            heapq.heappush(self._waiters, ticket)
+            try:
+                while True:
+                    timeout = None
+                    if self._waiters[0] == ticket:
+                        now = time.monotonic()
+                        timeout = self._wait_time(tokens, now)
+                        if timeout <= 0:
+                            if self.requests:
+                                self.requests.consume(1, now)
+                            if self.tokens and tokens:
+                                self.tokens.consume(tokens, now)
+                            return
+                    self._cond.wait(timeout=timeout)
+            finally:
+                self._waiters.remove(ticket)
+                heapq.heapify(self._waiters)
+                self._cond.notify_all()
+
+    def block_for(self, seconds: float) -> None:
+        """Hold back every request for this limiter, e.g. after a 429."""
+        with self._cond:
+            self._blocked_until = max(
+                self._blocked_until, time.monotonic() + seconds
+            )
+            self._cond.notify_all()
+
+    def _wait_time(self, tokens: int, now: float) -> float:
+        wait = self._blocked_until - now
+        if self.requests:
+            wait = max(wait, self.requests.wait_time(1, now))
+        if self.tokens and tokens:
+            wait = max(wait, self.tokens.wait_time(tokens, now))
+        return wait
+
+
+def _status_code(error: Exception) -> Optional[int]:
+    status = getattr(error, "status_code", None)
+    if status is None:
+        status = getattr(getattr(error, "response", None), "status_code", None)
+    return status if isinstance(status, int) else None
+
+
+def _is_retryable(error: Exception, status: Optional[int]) -> bool:
+    if status is not None:
+        return status in RETRYABLE_STATUS_CODES
+    if isinstance(error, (ConnectionError, TimeoutError)):
+        return True
+    return any(cls.__name__ in RETRYABLE_ERROR_NAMES for cls in type(error).__mro__)
+
+
+def _retry_after(error: Exception) -> Optional[float]:
+    """Read the server's requested delay from Retry-After style headers."""
+    headers = getattr(getattr(error, "response", None), "headers", None)
+    if not headers:
+        return None
+
+    retry_after_ms = headers.get("retry-after-ms")
+    if retry_after_ms:
+        try:
+            return float(retry_after_ms) / 1000
+        except ValueError:
+            pass
+
+    retry_after = headers.get("retry-after")
+    if not retry_after:
+        return None
+    try:
+        return max(0.0, float(retry_after))
+    except ValueError:
+        pass
+
+    try:
+        parsed = email.utils.parsedate_to_datetime(retry_after)
+    except (TypeError, ValueError):
+        return None
+    return max(0.0, parsed.timestamp() - time.time())
+
+
+class RequestScheduler:
+    """Shared gate for cloud calls with per-provider/model limits and retries."""
+
+    def __init__(
+        self,
+        limits: Optional[dict[str, dict[str, Any]]] = None,
+        max_retries: int = SCHEDULER_MAX_RETRIES,
+        base_delay: float = SCHEDULER_BASE_DELAY,
+        max_delay: float = SCHEDULER_MAX_DELAY,
+    ):
+        self.limits = dict(RATE_LIMITS if limits is None else limits)
+        self.max_retries = max_retries
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self._limiters: dict[str, RateLimiter] = {}
+        self._lock = threading.Lock()
+
+    def set_limit(
+        self,
+        provider: str,
+        model: Optional[str] = None,
+        rpm: Optional[int] = None,
+        tpm: Optional[int] = None,
+    ) -> None:
+        """Configure limits for a provider, or for one of its models."""
+        key = f"{provider}/{model}" if model else provider
+        with self._lock:
+            self.limits[key] = {"rpm": rpm, "tpm": tpm}
+            self._limiters = {
+                k: v for k, v in self._limiters.items() if k.split("/")[0] != provider
+            }
+
+    def limiter(self, provider: str, model: str) -> RateLimiter:
+        key = f"{provider}/{model}"
+        with self._lock:
+            if key not in self._limiters:
+                limits = self.limits.get(key) or self.limits.get(provider) or {}
+                self._limiters[key] = RateLimiter(limits.get("rpm"), limits.get("tpm"))
+            return self._limiters[key]
+
+    def call(
+        self, provider: str, model: str, fn: Callable[[], T], tokens: int = 0
+    ) -> T:
+        """
+        Run `fn` once the provider/model limits allow it.
+
+        Rate limit, transient server, connection and timeout errors are
+        retried, honoring Retry-After when the server sends it and otherwise
+        backing off exponentially with full jitter.
+        """
+        limiter = self.limiter(provider, model)
+        priority = _priority.get()
+
+        attempt = 0
+        while True:
+            limiter.acquire(tokens, priority)
+            try:
+                return fn()
+            except Exception as e:
+                status = _status_code(e)
+                if not _is_retryable(e, status):
+                    raise
+                if attempt == self.max_retries:
+                    if status == 429:
+                        raise RateLimitError(
+                            f"{provider}/{model} still rate limited after "
+                            f"{self.max_retries} retries: {e}"
+                        ) from e
+                    raise
+
+                delay = _retry_after(e)
+                if delay is None:
+                    delay = random.uniform(
+                        0, min(self.max_delay, self.base_delay * 2**attempt)
+                    )
+                reason = f"returned {status}" if status else f"failed ({e})"
+                logger.warning(
+                    f"{provider}/{model} {reason}, retrying in {delay:.1f}s "
+                    f"(attempt {attempt + 1}/{self.max_retries})"
+                )
+
+                if status == 429:
+                    # Every caller sharing this limit backs off, not just this one
+                    limiter.block_for(delay)
+                else:
+                    time.sleep(delay)
+                attempt += 1
+
+
+@contextmanager
+def priority(value: int) -> Iterator[None]:
+    """Run cloud calls made in this context at the given priority (lower first)."""
+    token = _priority.set(value)
+    try:
+        yield
+    finally:
+        _priority.reset(token)
+
+
+scheduler = RequestScheduler()
@@ -0,0 +1,529 @@
+"""Local HTTP job server that keeps transcription and provider state warm."""
+
+import json
+import queue
+import threading
+import time
+import uuid
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from http import HTTPStatus
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from typing import Any, Optional
+
+import click
+
+from read_audio import pipeline, scheduler
+from read_audio.constants import (
+    DEFAULT_WHISPER_MODEL,
+    DEFAULT_LANGUAGE,
+    DEFAULT_CONDENSE_PERCENTAGE,
+    DEFAULT_PRIORITY,
+    MODEL_MAPPING,
+    ROUTING_DEADLINE,
+    ROUTING_HEDGE_DELAY,
+    SERVER_HOST,
+    SERVER_PORT,
+    SERVER_WORKERS,
+    SERVER_MAX_QUEUE,
+    SERVER_MAX_FINISHED_JOBS,
+    SERVER_CACHE_DIR,
+)
+from read_audio.errors import JobValidationError, PartialOutputError, QueueFullError
+from read_audio.logger import logger
+from read_audio.providers import (
+    AIProvider,
+    RoutingProvider,
+    get_provider,
+    get_routing_provider,
+)
+from read_audio.transcribe import whisper
+
+MODES = ("summary", "condense")
+PROVIDERS = tuple(MODEL_MAPPING)
+
+
+@dataclass
+class Job:
+    """A submitted job and its per-stage progress."""
+
+    id: str
+    options: dict[str, Any]
+    status: str = "queued"
+    stages: dict[str, dict[str, Any]] = field(
+        default_factory=lambda: {stage: {"state": "pending"} for stage in pipeline.STAGES}
+    )
+    output_files: list[Path] = field(default_factory=list)
+    error: Optional[str] = None
+    output_errors: dict[str, str] = field(default_factory=dict)
+    created_at: float = field(default_factory=time.time)
+    started_at: Optional[float] = None
+    finished_at: Optional[float] = None
+
+    def update_stage(self, stage: str, state: str) -> None:
+        now = time.time()
+        info = self.stages.setdefault(stage, {})
+        info["state"] = state
+        if state == "running":
+            info["started_at"] = now
+        elif "started_at" in info:
+            info["finished_at"] = now
+            info["duration"] = round(now - info["started_at"], 3)
+
+    def to_dict(self) -> dict[str, Any]:
+        return {
+            "id": self.id,
+            "status": self.status,
+            "stages": self.stages,
+            "output_files": [str(path) for path in self.output_files],
+            "error": self.error,
+            "output_errors": self.output_errors,
+            "created_at": self.created_at,
+            "started_at": self.started_at,
+            "finished_at": self.finished_at,
+        }
+
+
+class JobManager:
+    """Bounded job queue served by a pool of long-lived worker threads."""
+
+    def __init__(
+        self,
+        output: Path,
+        workers: int = SERVER_WORKERS,
+        max_queue: int = SERVER_MAX_QUEUE,
+        max_finished: int = SERVER_MAX_FINISHED_JOBS,
+        provider: str = "ollama",
+        model: Optional[str] = None,
+        fallback_providers: tuple[str, ...] = (),
+        whisper_model: str = DEFAULT_WHISPER_MODEL,
+        deadline: float = ROUTING_DEADLINE,
+        hedge_delay: float = ROUTING_HEDGE_DELAY,
+    ):
+        self.output = output
+        self.cache_dir = output / SERVER_CACHE_DIR
+        self.deadline = deadline
+        self.hedge_delay = hedge_delay
+        self.workers = workers
+        self.max_finished = max_finished
+        self.defaults = {
+            "modes": ["summary"],
+            "provider": provider,
+            "model": model,
+            "fallback_providers": list(fallback_providers),
+            "whisper_model": whisper_model,
+            "language": DEFAULT_LANGUAGE,
+            "use_cloud_whisper": False,
+            "auto_whisper_model": False,
+            "condense_percentages": [DEFAULT_CONDENSE_PERCENTAGE],
+            "priority": DEFAULT_PRIORITY,
+            "split": True,
+            "incremental": False,
+        }
+
+        self._queue: queue.Queue[Job] = queue.Queue(maxsize=max_queue)
+        self._jobs: OrderedDict[str, Job] = OrderedDict()
+        self._jobs_lock = threading.Lock()
+        self._providers: dict[tuple[str, str, tuple[str, ...]], AIProvider] = {}
+        self._providers_lock = threading.Lock()
+        self._threads: list[threading.Thread] = []
+
+    def start(self) -> None:
+        for i in range(self.workers):
+            thread = threading.Thread(
+                target=self._work, name=f"read-audio-worker-{i}", daemon=True
+            )
+            thread.start()
+            self._threads.append(thread)
+
+    def warm_up(self) -> None:
+        """Load the default Whisper model and provider client ahead of the first job."""
+        if not self.defaults["use_cloud_whisper"]:
+            whisper.load_model(self.defaults["whisper_model"])
+        self._provider(
+            self.defaults["provider"],
+            self.defaults["model"],
+            self.defaults["fallback_providers"],
+        )
+
+    @property
+    def queue_depth(self) -> int:
+        return self._queue.qsize()
+
+    @property
+    def max_queue(self) -> int:
+        return self._queue.maxsize
+
+    def latencies(self) -> dict[str, dict[str, Any]]:
+        """Per-backend latency histograms of the routing providers in use."""
+        with self._providers_lock:
+            providers = dict(self._providers)
+        return {
+            "+".join([provider, *fallbacks]): {
+                name: histogram.to_dict()
+                for name, histogram in ai_provider.histograms.items()
+            }
+            for (provider, _, fallbacks), ai_provider in providers.items()
+            if isinstance(ai_provider, RoutingProvider)
+        }
+
+    def submit(self, spec: dict[str, Any]) -> Job:
+        options = self._validate(spec)
+        job = Job(id=uuid.uuid4().hex, options=options)
+
+        with self._jobs_lock:
+            self._jobs[job.id] = job
+
+        try:
+            self._queue.put_nowait(job)
+        except queue.Full:
+            with self._jobs_lock:
+                del self._jobs[job.id]
+            raise QueueFullError(f"Job queue is full ({self.max_queue} jobs)")
+
+        return job
+
+    def get(self, job_id: str) -> Optional[Job]:
+        with self._jobs_lock:
+            return self._jobs.get(job_id)
+
+    def _validate(self, spec: dict[str, Any]) -> dict[str, Any]:
+        unknown = set(spec) - set(self.defaults) - {"url", "file", "transcript"}
+        if unknown:
+            raise JobValidationError(f"Unknown job fields: {sorted(unknown)}")
+
+        options = {**self.defaults, **spec}
+
+        sources = [k for k in ("url", "file", "transcript") if options.get(k)]
+        if len(sources) != 1:
+            raise JobValidationError(
+                "Exactly one of url, file, or transcript must be provided"
+            )
+        for key in (*sources, "whisper_model"):
+            if not isinstance(options[key], str):
+                raise JobValidationError(f"{key} must be a string")
+        for key in ("model", "language"):
+            if options[key] is not None and not isinstance(options[key], str):
+                raise JobValidationError(f"{key} must be a string or null")
+        for key in ("file", "transcript"):
+            if options.get(key):
+                path = Path(options[key])
+                if not path.exists():
+                    raise JobValidationError(f"{key} does not exist: {path}")
+                options[key] = path
+
+        modes = options["modes"]
+        if (
+            not isinstance(modes, list)
+            or not modes
+            or not all(isinstance(mode, str) and mode in MODES for mode in modes)
+        ):
+            raise JobValidationError(f"modes must be a non-empty list drawn from {list(MODES)}")
+        if options["provider"] not in PROVIDERS:
+            raise JobValidationError(f"provider must be one of {list(PROVIDERS)}")
+        fallbacks = options["fallback_providers"]
+        if not isinstance(fallbacks, list) or not all(
+            isinstance(fallback, str) and fallback in PROVIDERS for fallback in fallbacks
+        ):
+            raise JobValidationError(
+                f"fallback_providers must be a list drawn from {list(PROVIDERS)}"
+            )
+        if "model" not in spec and options["provider"] != self.defaults["provider"]:
+            options["model"] = None  # Use the provider's default model
+
+        percentages = options["condense_percentages"]
+        if (
+            not isinstance(percentages, list)
+            or not percentages
+            or not all(
+                isinstance(p, int) and not isinstance(p, bool) and 1 <= p <= 100
+                for p in percentages
+            )
+        ):
+            raise JobValidationError(
+                "condense_percentages must be a non-empty list of values between 1 and 100"
+            )
+        if not isinstance(options["priority"], int) or isinstance(options["priority"], bool):
+            raise JobValidationError("priority must be an integer")
+        for key in ("split", "incremental", "use_cloud_whisper", "auto_whisper_model"):
+            if not isinstance(options[key], bool):
+                raise JobValidationError(f"{key} must be a boolean")
+
+        return options
+
+    def _provider(
+        self, provider: str, model: Optional[str], fallback_providers: list[str]
+    ) -> AIProvider:
+        # Providers are shared across jobs so routing latency history accumulates
+        model = model or MODEL_MAPPING[provider]
+        key = (provider, model, tuple(fallback_providers))
+        with self._providers_lock:
+            if key not in self._providers:
+                if fallback_providers:
+                    self._providers[key] = get_routing_provider(
+                        [provider, *fallback_providers],
+                        model,
+                        deadline=self.deadline,
+                        hedge_delay=self.hedge_delay,
+                    )
+                else:
+                    self._providers[key] = get_provider(provider, model)
+            return self._providers[key]
+
+    def _work(self) -> None:
+        while True:
+            job = self._queue.get()
+            try:
+                self._run(job)
+            finally:
+                self._queue.task_done()
+                self._evict_finished()
+
+    def _run(self, job: Job) -> None:
+        job.status = "running"
+        job.started_at = time.time()
+        options = dict(job.options)
+
+        try:
+            ai_provider = self._provider(
+                options["provider"],
+                options["model"],
+                options.pop("fallback_providers"),
+            )
+            # Each job writes its results to its own directory so jobs for
+            # the same URL or file name cannot overwrite each other, while
+            # section stores and language probes are shared across jobs
+            output = self.output / job.id
+            output.mkdir(parents=True, exist_ok=True)
+            self.cache_dir.mkdir(parents=True, exist_ok=True)
+            with scheduler.priority(options.pop("priority")):
+                job.output_files = pipeline.run(
+                    ai_provider=ai_provider,
+                    output=output,
+                    cache_dir=self.cache_dir,
+                    progress=job.update_stage,
+                    **options,
+                )
+            job.status = "done"
+        except Exception as e:
+            logger.exception(f"Job {job.id} failed")
+            for info in job.stages.values():
+                if info["state"] == "running":
+                    info["state"] = "failed"
+            job.error = str(e)
+            if isinstance(e, PartialOutputError):
+                # The outputs that were written can still be fetched
+                job.output_files = e.output_files
+                job.output_errors = e.errors
+                job.status = "partial"
+            else:
+                job.status = "failed"
+        finally:
+            job.finished_at = time.time()
+
+    def _evict_finished(self) -> None:
+        with self._jobs_lock:
+            finished = [
+                job_id
+                for job_id, job in self._jobs.items()
+                if job.status in ("done", "partial", "failed")
+            ]
+            for job_id in finished[: max(0, len(finished) - self.max_finished)]:
+                del self._jobs[job_id]
+
+
+class JobRequestHandler(BaseHTTPRequestHandler):
+    """JSON endpoints for submitting jobs and polling their status and results."""
+
+    manager: JobManager
+
+    def do_POST(self) -> None:
+        if self.path.rstrip("/") != "/jobs":
+            return self._send(HTTPStatus.NOT_FOUND, {"error": "Not found"})
+
+        try:
+            length = int(self.headers.get("Content-Length", 0))
+            if length < 0:
+                raise ValueError(f"Invalid Content-Length: {length}")
+            spec = json.loads(self.rfile.read(length) or b"{}")
+            if not isinstance(spec, dict):
+                raise JobValidationError("Job specification must be a JSON object")
+            job = self.manager.submit(spec)
+        except (ValueError, TypeError, JobValidationError) as e:
+            # Includes malformed JSON and Content-Length headers
+            return self._send(HTTPStatus.BAD_REQUEST, {"error": str(e)})
+        except QueueFullError as e:
+            return self._send(
+                HTTPStatus.SERVICE_UNAVAILABLE,
+                {"error": str(e), "queue_depth": self.manager.queue_depth},
+                headers={"Retry-After": "5"},
+            )
+
+        self._send(
+            HTTPStatus.ACCEPTED,
+            {"id": job.id, "status": job.status, "queue_depth": self.manager.queue_depth},
+            headers={"Location": f"/jobs/{job.id}"},
+        )
+
+    def do_GET(self) -> None:
+        parts = [p for p in self.path.split("?")[0].split("/") if p]
+
+        if parts == ["health"]:
+            return self._send(
+                HTTPStatus.OK,
+                {
+                    "workers": self.manager.workers,
+                    "queue_depth": self.manager.queue_depth,
+                    "max_queue": self.manager.max_queue,
+                    "latencies": self.manager.latencies(),
+                },
+            )
+
+        if len(parts) not in (2, 3) or parts[0] != "jobs":
+            return self._send(HTTPStatus.NOT_FOUND, {"error": "Not found"})
+
+        job = self.manager.get(parts[1])
+        if job is None:
+            return self._send(HTTPStatus.NOT_FOUND, {"error": "Unknown job"})
+
+        if len(parts) == 2:
+            return self._send(HTTPStatus.OK, job.to_dict())
+
+        if parts[2] != "result":
+            return self._send(HTTPStatus.NOT_FOUND, {"error": "Not found"})
+        if job.status not in ("done", "partial"):
+            return self._send(HTTPStatus.CONFLICT, job.to_dict())
+
+        results = []
+        for output_file in job.output_files:
+            with open(output_file, "r", encoding="utf-8") as f:
+                results.append({"output_file": str(output_file), "result": f.read()})
+        self._send(
+            HTTPStatus.OK,
+            {"id": job.id, "results": results, "output_errors": job.output_errors},
+        )
+
+    def log_message(self, format: str, *args: Any) -> None:
+        logger.debug(f"{self.address_string()} - {format % args}")
+
+    def _send(
+        self,
+        status: HTTPStatus,
+        body: dict[str, Any],
+        headers: Optional[dict[str, str]] = None,
+    ) -> None:
+        payload = json.dumps(body).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(payload)))
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(payload)
+
+
+@click.command()
+@click.option("--host", default=SERVER_HOST, help="Address to bind to")
+@click.option("--port", type=int, default=SERVER_PORT, help="Port to listen on")
+@click.option(
+    "--workers",
+    type=click.IntRange(min=1),
+    default=SERVER_WORKERS,
+    help="Number of worker threads processing jobs",
+)
+@click.option(
+    "--max-queue",
+    type=click.IntRange(min=1),
+    default=SERVER_MAX_QUEUE,
+    help="Maximum number of queued jobs before submissions are rejected",
+)
+@click.option(
+    "--output",
+    type=click.Path(path_type=Path),
+    default=Path("/tmp"),
+    help="Output directory for processed files",
+)
+@click.option(
+    "--provider",
+    type=click.Choice(list(PROVIDERS)),
+    default="ollama",
+    help="Default AI provider for jobs that do not specify one",
+)
+@click.option(
+    "--model",
+    default=None,
+    help="Default model for jobs that do not specify one",
+)
+@click.option(
+    "--fallback-provider",
+    "fallback_providers",
+    type=click.Choice(list(PROVIDERS)),
+    multiple=True,
+    help="Default provider to hedge to when the primary is slow or failing (repeatable)",
+)
+@click.option(
+    "--hedge-delay",
+    type=click.FloatRange(min=0),
+    default=ROUTING_HEDGE_DELAY,
+    help="Seconds before a hedged request is sent to a fallback provider",
+)
+@click.option(
+    "--deadline",
+    type=click.FloatRange(min=0, min_open=True),
+    default=ROUTING_DEADLINE,
+    help="Seconds to wait for any provider to answer",
+)
+@click.option(
+    "--whisper-model",
+    default=DEFAULT_WHISPER_MODEL,
+    help=f"Default Whisper model (default: {DEFAULT_WHISPER_MODEL})",
+)
+@click.option(
+    "--no-warm-up",
+    is_flag=True,
+    help="Skip loading the default Whisper model and provider at startup",
+)
+def main(
+    host: str,
+    port: int,
+    workers: int,
+    max_queue: int,
+    output: Path,
+    provider: str,
+    model: Optional[str],
+    fallback_providers: tuple[str, ...],
+    hedge_delay: float,
+    deadline: float,
+    whisper_model: str,
+    no_warm_up: bool,
+) -> None:
+    """Serve read-audio jobs over a local HTTP API"""
+    manager = JobManager(
+        output=output,
+        workers=workers,
+        max_queue=max_queue,
+        provider=provider,
+        model=model,
+        fallback_providers=fallback_providers,
+        whisper_model=whisper_model,
+        deadline=deadline,
+        hedge_delay=hedge_delay,
+    )
+    if not no_warm_up:
+        manager.warm_up()
+    manager.start()
+
+    handler = type("Handler", (JobRequestHandler,), {"manager": manager})
+    server = ThreadingHTTPServer((host, port), handler)
+    logger.info(f"Serving on http://{host}:{port} with {workers} workers")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+
+
+if __name__ == "__main__":
+    main()
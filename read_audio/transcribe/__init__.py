@@ -1,3 +1,4 @@
 from . import whisper
+from . import language
 
-__all__ = ["whisper"]
+__all__ = ["whisper", "language"]
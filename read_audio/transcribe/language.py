@@ -0,0 +1,187 @@
+import hashlib
+import json
+import os
+import subprocess
+from pathlib import Path
+from typing import Optional
+
+import numpy as np
+import whisper
+from read_audio.errors import LanguageProbeError
+from read_audio.logger import logger
+from read_audio.constants import (
+    PROBE_WHISPER_MODEL,
+    PROBE_WINDOW_SECONDS,
+    PROBE_OFFSETS,
+)
+from read_audio.transcribe.whisper import load_model, model_lock
+
+# Whisper sizes that have an English-only variant
+_ENGLISH_ONLY_SIZES = ("tiny", "base", "small", "medium")
+
+
+def _fingerprint(audio_path: Path) -> str:
+    """Identify audio by size and leading bytes, so re-downloads hit the cache."""
+    digest = hashlib.sha256()
+    digest.update(str(os.path.getsize(audio_path)).encode())
+    with open(audio_path, "rb") as f:
+        digest.update(f.read(1024 * 1024))
+    return digest.hexdigest()
+
+
+def _duration(audio_path: Path) -> Optional[float]:
+    """Duration in seconds, None when ffprobe cannot tell (e.g. "N/A" for streams)."""
+    result = subprocess.run(
+        [
+            "ffprobe",
+            "-v",
+            "error",
+            "-show_entries",
+            "format=duration",
+            "-of",
+            "default=noprint_wrappers=1:nokey=1",
+            str(audio_path),
+        ],
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    try:
+        return float(result.stdout.strip())
+    except ValueError:
+        return None
+
+
+def _decode_window(audio_path: Path, offset: float, seconds: float) -> np.ndarray:
+    """Decode only [offset, offset + seconds) as 16 kHz mono float32."""
+    result = subprocess.run(
+        [
+            "ffmpeg",
+            "-nostdin",
+            "-ss",
+            f"{offset:.3f}",
+            "-t",
+            f"{seconds:.3f}",
+            "-i",
+            str(audio_path),
+            "-f",
+            "s16le",
+            "-ac",
+            "1",
+            "-ar",
+            str(whisper.audio.SAMPLE_RATE),
+            "-",
+        ],
+        capture_output=True,
+        check=True,
+    )
+    return np.frombuffer(result.stdout, np.int16).astype(np.float32) / 32768.0
+
+
+def probe_language(
+    audio_path: Path,
+    cache_path: Optional[Path] = None,
+    model_name: str = PROBE_WHISPER_MODEL,
+) -> tuple[str, float]:
+    """
+    Detect the spoken language from a few short windows of the audio.
+
+    Windows are taken at PROBE_OFFSETS (fractions of the duration) and their
+    language probabilities are averaged. The result is stored in cache_path,
+    when given, and reused for the same audio. Without a known duration
+    only the first window is probed.
+
+    Returns:
+        Tuple of (language code, confidence between 0 and 1)
+
+    Raises:
+        LanguageProbeError: When the audio cannot be read or decoded
+    """
+    try:
+        fingerprint = _fingerprint(audio_path)
+    except OSError as e:
+        raise LanguageProbeError(f"Language probe failed: {e}") from e
+
+    if cache_path and cache_path.exists():
+        try:
+            with open(cache_path, "r", encoding="utf-8") as f:
+                cached = json.load(f)
+            if cached.get("fingerprint") == fingerprint:
+                logger.info(f"Using cached language probe: {cache_path}")
+                return cached["language"], cached["confidence"]
+        except (OSError, ValueError, KeyError) as e:
+            logger.warning(f"Ignoring unreadable language cache {cache_path}: {e}")
+
+    try:
+        model = load_model(model_name)
+        if not model.is_multilingual:
+            raise ValueError(f"Whisper model {model_name} cannot detect languages")
+
+        duration = _duration(audio_path)
+        offsets = (
+            [
+                max(0.0, min(duration * fraction, duration - PROBE_WINDOW_SECONDS))
+                for fraction in PROBE_OFFSETS
+            ]
+            if duration is not None
+            else [0.0]
+        )
+        totals: dict[str, float] = {}
+        windows = 0
+        for offset in offsets:
+            audio = _decode_window(audio_path, offset, PROBE_WINDOW_SECONDS)
+            if not audio.size:
+                continue
+
+            mel = whisper.log_mel_spectrogram(
+                whisper.pad_or_trim(audio), n_mels=model.dims.n_mels
+            ).to(model.device)
+            with model_lock(model_name):
+                _, probs = model.detect_language(mel)
+
+            for language, probability in probs.items():
+                totals[language] = totals.get(language, 0.0) + probability
+            windows += 1
+
+        if not windows:
+            raise ValueError("No audio could be decoded for the language probe")
+
+    except (OSError, ValueError, RuntimeError, subprocess.CalledProcessError) as e:
+        raise LanguageProbeError(f"Language probe failed: {e}") from e
+
+    language = max(totals, key=totals.__getitem__)
+    confidence = totals[language] / windows
+
+    if cache_path:
+        try:
+            with open(cache_path, "w", encoding="utf-8") as f:
+                json.dump(
+                    {
+                        "fingerprint": fingerprint,
+                        "language": language,
+                        "confidence": confidence,
+                        "model": model_name,
+                    },
+                    f,
+                    indent=2,
+                )
+        except OSError as e:
+            logger.warning(f"Could not cache language probe in {cache_path}: {e}")
+
+    return language, confidence
+
+
+def whisper_model_for(language: str, model_name: str) -> str:
+    """
+    Switch between English-only and multilingual variants of a model size.
+
+    The size itself is kept: "small" becomes "small.en" for English and
+    "small.en" becomes "small" otherwise. Sizes without an English-only
+    variant (large, turbo) are returned unchanged.
+    """
+    base_name = model_name.removesuffix(".en")
+    if language == "en" and base_name in _ENGLISH_ONLY_SIZES:
+        return f"{base_name}.en"
+    if language != "en":
+        return base_name
+    return model_name
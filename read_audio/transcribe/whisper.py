@@ -1,15 +1,47 @@
+from functools import lru_cache
+import importlib.util
 from pathlib import Path
 import platform
+import threading
 
 import whisper
+from read_audio.errors import RateLimitError
 from read_audio.logger import logger
 from read_audio.constants import (
     DEFAULT_WHISPER_MODEL,
+    DEFAULT_WHISPER_CLOUD_MODEL,
     DEFAULT_MLX_WHISPER_MODEL_REPO,
 )
+from read_audio.scheduler import scheduler
 from read_audio.utils.audio import split_audio_file
 
 
+# Loaded models are kept warm for reuse across transcriptions. Whisper installs
+# per-call hooks on the model while decoding, so calls on a model are serialized.
+_model_locks: dict[str, threading.Lock] = {}
+_model_locks_guard = threading.Lock()
+
+
+@lru_cache(maxsize=None)
+def load_model(model_name: str = DEFAULT_WHISPER_MODEL) -> whisper.Whisper:
+    """Load a Whisper model once and keep it in memory."""
+    logger.info(f"Loading Whisper model: {model_name}")
+    return whisper.load_model(model_name)
+
+
+def model_lock(model_name: str) -> threading.Lock:
+    with _model_locks_guard:
+        return _model_locks.setdefault(model_name, threading.Lock())
+
+
+@lru_cache(maxsize=None)
+def _cloud_client():
+    from openai import OpenAI
+
+    # Retries are handled by the shared scheduler
+    return OpenAI(max_retries=0)
+
+
 def _is_apple_silicon() -> bool:
     """Check if we're running on Apple Silicon."""
     return platform.system() == "Darwin" and platform.machine() == "arm64"
@@ -59,13 +91,14 @@ def _transcribe_with_whisper(
     output_path = output_dir / f"{audio_path.stem}.txt"
 
     try:
-        model = whisper.load_model(model_name)
+        model = load_model(model_name)
 
-        result = model.transcribe(
-            str(audio_path),
-            language=language,  # None means auto-detect
-            verbose=False,
-        )
+        with model_lock(model_name):
+            result = model.transcribe(
+                str(audio_path),
+                language=language,  # None means auto-detect
+                verbose=False,
+            )
 
         with open(output_path, "w", encoding="utf-8") as f:
             f.write(result["text"])
@@ -91,23 +124,27 @@ def _transcribe_with_whisper_cloud(
     all_transcripts = []
 
     try:
-        from openai import OpenAI
-
-        client = OpenAI()
+        client = _cloud_client()
 
         # Process each chunk
         for chunk_path in split_audio_file(audio_path, output_dir):
             logger.info(f"Transcribing chunk: {chunk_path.name}")
 
-            with open(chunk_path, "rb") as audio_file:
-                response = client.audio.transcriptions.create(
-                    model="whisper-1",
-                    file=audio_file,
-                    language=language,
-                    response_format="text",
-                )
-                # response is already a string when response_format="text"
-                all_transcripts.append(response)
+            def create_transcription(chunk_path: Path = chunk_path) -> str:
+                # Reopened on every attempt so retries upload the whole file
+                with open(chunk_path, "rb") as audio_file:
+                    return client.audio.transcriptions.create(
+                        model=DEFAULT_WHISPER_CLOUD_MODEL,
+                        file=audio_file,
+                        language=language,
+                        response_format="text",
+                    )
+
+            # response is already a string when response_format="text"
+            response = scheduler.call(
+                "openai", DEFAULT_WHISPER_CLOUD_MODEL, create_transcription
+            )
+            all_transcripts.append(response)
 
             # Clean up chunk if it's not the original file
             if chunk_path != audio_path:
@@ -121,10 +158,27 @@ def _transcribe_with_whisper_cloud(
 
         return output_path
 
+    except RateLimitError:
+        # Still rate limited after the scheduler's retries
+        raise
     except Exception as e:
         raise RuntimeError(f"Whisper cloud transcription failed: {e}") from e
 
 
+def uses_mlx(use_cloud: bool = False) -> bool:
+    """
+    Whether transcribe() will use MLX-Whisper.
+
+    MLX-Whisper always runs DEFAULT_MLX_WHISPER_MODEL_REPO and ignores
+    model_name.
+    """
+    return (
+        not use_cloud
+        and platform.system() == "Darwin"
+        and importlib.util.find_spec("mlx_whisper") is not None
+    )
+
+
 def transcribe(
     audio_path: Path,
     output_dir: Path,
@@ -0,0 +1,126 @@
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import openai
+import pytest
+
+
+def _openai_body(status: int, model: str) -> dict:
+    if status < 400:
+        return {
+            "id": "chatcmpl-fake",
+            "object": "chat.completion",
+            "created": int(time.time()),
+            "model": model,
+            "choices": [
+                {
+                    "index": 0,
+                    "message": {"role": "assistant", "content": f"answer from {model}"},
+                    "finish_reason": "stop",
+                }
+            ],
+            "usage": {"prompt_tokens": 1, "completion_tokens": 1, "total_tokens": 2},
+        }
+    return {
+        "error": {
+            "message": f"Fake error {status}",
+            "type": "rate_limit_exceeded" if status == 429 else "server_error",
+            "param": None,
+            "code": None,
+        }
+    }
+
+
+def _anthropic_body(status: int, model: str) -> dict:
+    if status < 400:
+        return {
+            "id": "msg_fake",
+            "type": "message",
+            "role": "assistant",
+            "model": model,
+            "content": [{"type": "text", "text": f"answer from {model}"}],
+            "stop_reason": "end_turn",
+            "stop_sequence": None,
+            "usage": {"input_tokens": 1, "output_tokens": 1},
+        }
+    return {
+        "type": "error",
+        "error": {
+            "type": "rate_limit_error" if status == 429 else "api_error",
+            "message": f"Fake error {status}",
+        },
+    }
+
+
+class FakeServer:
+    """
+    Local HTTP server answering OpenAI chat completion and Anthropic messages
+    requests from a script of (status, headers) responses.
+
+    Once the script runs out every request succeeds. The model and arrival
+    time of each request are recorded.
+    """
+
+    def __init__(self):
+        self.script: list[tuple[int, dict[str, str]]] = []
+        self.requests: list[tuple[str, float]] = []
+        self._lock = threading.Lock()
+
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_POST(self) -> None:
+                length = int(self.headers.get("Content-Length", 0))
+                model = json.loads(self.rfile.read(length) or b"{}").get("model", "")
+                with server._lock:
+                    server.requests.append((model, time.monotonic()))
+                    status, headers = (
+                        server.script.pop(0) if server.script else (200, {})
+                    )
+
+                if self.path.endswith("/messages"):
+                    body = _anthropic_body(status, model)
+                else:
+                    body = _openai_body(status, model)
+                payload = json.dumps(body).encode()
+
+                self.send_response(status)
+                self.send_header("Content-Type", "application/json")
+                for name, value in headers.items():
+                    self.send_header(name, value)
+                self.send_header("Content-Length", str(len(payload)))
+                self.end_headers()
+                self.wfile.write(payload)
+
+            def log_message(self, format: str, *args) -> None:
+                pass
+
+        self.httpd = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        self.url = f"http://127.0.0.1:{self.httpd.server_address[1]}"
+        self._thread = threading.Thread(target=self.httpd.serve_forever, daemon=True)
+        self.openai = openai.OpenAI(
+            base_url=f"{self.url}/v1", api_key="test", max_retries=0
+        )
+
+    def request(self, model: str = "m") -> str:
+        """Send a chat completion through the OpenAI SDK, which raises its own errors."""
+        response = self.openai.chat.completions.create(
+            model=model, messages=[{"role": "user", "content": "hello"}]
+        )
+        return response.choices[0].message.content
+
+
+@pytest.fixture
+def fake_server(monkeypatch):
+    server = FakeServer()
+    server._thread.start()
+    # Providers create their own clients, pointed at the server through the SDKs' settings
+    monkeypatch.setenv("OPENAI_BASE_URL", f"{server.url}/v1")
+    monkeypatch.setenv("OPENAI_API_KEY", "test")
+    monkeypatch.setenv("ANTHROPIC_BASE_URL", server.url)
+    monkeypatch.setenv("ANTHROPIC_API_KEY", "test")
+    yield server
+    server.httpd.shutdown()
+    server.httpd.server_close()
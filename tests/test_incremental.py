@@ -0,0 +1,136 @@
+import json
+from typing import Optional
+
+import pytest
+
+from read_audio import incremental, pipeline
+from read_audio.incremental import SectionStore, split_sections
+from read_audio.providers import AIProvider
+
+SENTENCES = [
+    f"Speaker {i % 3} talks about topic number {i} for a little while." for i in range(1500)
+]
+TRANSCRIPT = " ".join(SENTENCES)
+
+
+class CountingProvider(AIProvider):
+    """Answers with a placeholder and records every text it is sent."""
+
+    model = "llama3.1:8b"
+
+    def __init__(self):
+        self.calls: list[str] = []
+
+    def process_text(
+        self,
+        text: str,
+        mode: str,
+        prompt: Optional[str] = None,
+        max_tokens: Optional[int] = None,
+        context_size: Optional[int] = None,
+    ) -> str:
+        self.calls.append(text)
+        return f"summary of {len(text)} characters"
+
+    def summarize(self, text: str) -> str:
+        return self.process_text(text, "summary")
+
+    def condense(self, text: str) -> str:
+        return self.process_text(text, "condense")
+
+
+def process(provider: CountingProvider, text: str, store_path, mode="summary") -> str:
+    return pipeline._process_incremental(
+        provider,
+        text,
+        mode,
+        20 if mode == "condense" else None,
+        "ollama",
+        "llama3.1:8b",
+        True,
+        store_path=store_path,
+    )
+
+
+def test_sections_cover_the_text():
+    sections = split_sections(TRANSCRIPT)
+
+    assert len(sections) > 5
+    assert " ".join(sections) == TRANSCRIPT
+
+
+def test_editing_a_sentence_changes_about_one_section():
+    sentences = list(SENTENCES)
+    sentences[700] = "Someone corrected this line."
+    before = split_sections(TRANSCRIPT)
+    after = split_sections(" ".join(sentences))
+
+    changed = set(after) - set(before)
+
+    assert 1 <= len(changed) <= 2
+
+
+def test_appending_keeps_earlier_sections():
+    before = split_sections(TRANSCRIPT)
+    after = split_sections(
+        TRANSCRIPT + " " + " ".join(f"An appended sentence {i}." for i in range(50))
+    )
+
+    assert after[: len(before) - 1] == before[:-1]
+
+
+def test_unchanged_rerun_makes_no_provider_calls(tmp_path):
+    store_path = tmp_path / "talk_summary.sections.json"
+
+    first = CountingProvider()
+    result = process(first, TRANSCRIPT, store_path)
+    sections = len(split_sections(TRANSCRIPT))
+    assert len(first.calls) == sections + 1  # Each section, then the final summary
+
+    rerun = CountingProvider()
+    assert process(rerun, TRANSCRIPT, store_path) == result
+    assert rerun.calls == []
+
+
+def test_edit_reprocesses_only_changed_sections(tmp_path):
+    store_path = tmp_path / "talk_condensed.sections.json"
+    process(CountingProvider(), TRANSCRIPT, store_path, mode="condense")
+
+    sentences = list(SENTENCES)
+    sentences[700] = "Someone corrected this line."
+    rerun = CountingProvider()
+    process(rerun, " ".join(sentences), store_path, mode="condense")
+
+    assert 1 <= len(rerun.calls) <= 2
+    assert any("Someone corrected this line." in call for call in rerun.calls)
+
+
+def test_store_discards_results_from_other_settings(tmp_path):
+    path = tmp_path / "store.json"
+    store = SectionStore(path, signature={"mode": "summary"})
+    store.put("key", "partial")
+    store.save()
+
+    assert SectionStore(path, signature={"mode": "summary"}).get("key") == "partial"
+    assert SectionStore(path, signature={"mode": "condense"}).get("key") is None
+
+
+def test_interrupted_save_keeps_previous_store(tmp_path, monkeypatch):
+    path = tmp_path / "store.json"
+    store = SectionStore(path, signature={"mode": "summary"})
+    store.put("key", "partial")
+    store.save()
+
+    def interrupted_dump(data, f, **kwargs):
+        f.write('{"signature": ')
+        raise KeyboardInterrupt
+
+    store.put("other", "second partial")
+    monkeypatch.setattr(incremental.json, "dump", interrupted_dump)
+    with pytest.raises(KeyboardInterrupt):
+        store.save()
+    monkeypatch.undo()
+
+    with open(path, encoding="utf-8") as f:
+        assert json.load(f)["sections"] == {"key": "partial"}
+    assert list(tmp_path.iterdir()) == [path]
@@ -0,0 +1,147 @@
+import pytest
+
+from read_audio import preflight
+from read_audio.errors import PreflightError
+from read_audio.preflight import estimate_tokens, plan, split_sentences, split_text
+
+CJK_SENTENCE = "今天我们讨论了语音识别模型的训练方法和评估指标。"
+
+
+def test_split_sentences_keeps_text():
+    text = "First one. Second one?  Third!\nFourth"
+
+    sentences = split_sentences(text)
+
+    assert len(sentences) == 4
+    assert "".join(sentences) == text
+
+
+def test_split_sentences_at_cjk_terminators():
+    text = "第一句。第二句！第三句？第四句"
+
+    assert split_sentences(text) == ["第一句。", "第二句！", "第三句？", "第四句"]
+
+
+def test_split_text_at_sentence_boundaries():
+    text = " ".join(f"Sentence number {i} is here." for i in range(200))
+
+    chunks = split_text(text, 100)
+
+    assert len(chunks) > 1
+    assert all(estimate_tokens(chunk) <= 100 for chunk in chunks)
+    assert all(chunk.endswith(".") for chunk in chunks)
+    assert " ".join(chunks) == text
+
+
+def test_split_text_cuts_long_sentence_at_words():
+    text = " ".join(["word"] * 1000)
+
+    chunks = split_text(text, 50)
+
+    assert all(estimate_tokens(chunk) <= 50 for chunk in chunks)
+    assert " ".join(chunks).split() == text.split()
+
+
+def test_split_text_cjk_without_spaces():
+    text = CJK_SENTENCE * 200
+
+    chunks = split_text(text, 100)
+
+    assert len(chunks) > 1
+    assert all(estimate_tokens(chunk) <= 100 for chunk in chunks)
+    assert "".join(chunks) == text
+
+
+def test_split_text_cuts_unpunctuated_text_at_characters():
+    text = "语" * 1000
+
+    chunks = split_text(text, 100)
+
+    assert all(estimate_tokens(chunk) <= 100 for chunk in chunks)
+    assert "".join(chunks) == text
+
+
+def test_plan_fits_short_text():
+    result = plan("A short transcript.", "Summarize.", "ollama", "llama3.1:8b")
+
+    assert result.fits
+    assert result.chunks == ["A short transcript."]
+    assert result.context_size % preflight.CONTEXT_SIZE_STEP == 0
+    assert result.context_size <= result.context_window
+
+
+def test_plan_splits_long_cjk_transcript():
+    text = CJK_SENTENCE * (140_000 // estimate_tokens(CJK_SENTENCE))
+    assert estimate_tokens(text) >= 135_000
+
+    result = plan(text, "Summarize.", "ollama", "llama3.1:8b")
+
+    assert not result.fits
+    assert len(result.chunks) >= 5
+    assert "".join(result.chunks) == text
+    # Checked against one token per character, not the planner's own estimate
+    for chunk in result.chunks:
+        call = len("Summarize.") + len(chunk)
+        assert call + result.max_output_tokens <= result.context_window
+
+
+@pytest.mark.parametrize(
+    "text",
+    [
+        CJK_SENTENCE,
+        "今日は音声認識モデルの訓練方法について話しました。",
+        "오늘은 음성 인식 모델의 학습 방법에 대해 이야기했습니다.",
+    ],
+)
+def test_estimate_does_not_undercount_cjk(text):
+    # At least one token per character, spaces aside
+    assert estimate_tokens(text * 100) >= len(text.replace(" ", "")) * 100
+
+
+def test_estimate_does_not_undercount_tiktoken():
+    tiktoken = pytest.importorskip("tiktoken")
+    try:
+        encoding = tiktoken.get_encoding("o200k_base")
+    except Exception:
+        pytest.skip("o200k_base encoding cannot be downloaded")
+
+    for text in (CJK_SENTENCE * 100, "Hello there, how are you doing? " * 100):
+        assert estimate_tokens(text) >= len(encoding.encode(text))
+
+
+def test_plan_condense_output_scales_with_input():
+    text = "Hello there. " * 1000
+
+    result = plan(text, "Condense.", "openai", "gpt-4o", output_ratio=0.5)
+
+    assert result.fits
+    assert result.max_output_tokens > preflight.count_tokens(text, "openai", "gpt-4o") // 2
+
+
+def test_plan_uses_smallest_limits_among_fallbacks():
+    text = "Hello there. " * 20_000
+
+    result = plan(
+        text,
+        "Condense.",
+        "openai",
+        "gpt-4o",
+        output_ratio=0.8,
+        fallbacks=[("anthropic", "claude-3-5-sonnet-latest"), ("ollama", "llama3.1:8b")],
+    )
+
+    assert result.max_output_tokens <= 8192
+    assert result.context_window == 32768
+    assert result.context_size <= 32768
+
+
+def test_plan_raises_when_chunks_still_too_large(monkeypatch):
+    monkeypatch.setattr(preflight, "split_text", lambda text, *args: [text])
+
+    with pytest.raises(PreflightError):
+        plan("word " * 100_000, "Summarize.", "ollama", "llama3.1:8b")
+
+
+def test_plan_raises_when_prompt_does_not_fit():
+    with pytest.raises(PreflightError):
+        plan("text", "prompt " * 200_000, "ollama", "llama3.1:8b")
@@ -0,0 +1,61 @@
+import time
+
+import openai
+import pytest
+
+from read_audio.errors import ProcessedTextError, RateLimitError
+from read_audio.providers import anthropic as anthropic_module
+from read_audio.providers import openai as openai_module
+from read_audio.providers.anthropic import AnthropicProvider
+from read_audio.providers.openai import OpenAIProvider
+from read_audio.scheduler import RequestScheduler
+
+
+@pytest.fixture(autouse=True)
+def fast_scheduler(monkeypatch):
+    scheduler = RequestScheduler(limits={}, max_retries=2, base_delay=0.05, max_delay=0.2)
+    monkeypatch.setattr(openai_module, "scheduler", scheduler)
+    monkeypatch.setattr(anthropic_module, "scheduler", scheduler)
+    return scheduler
+
+
+def test_openai_retries_after_retry_after(fake_server):
+    fake_server.script = [(429, {"Retry-After": "0.3"})]
+
+    start = time.monotonic()
+    result = OpenAIProvider("gpt-4o").process_text("Some text.", "summary")
+
+    assert result == "answer from gpt-4o"
+    assert len(fake_server.requests) == 2
+    assert time.monotonic() - start >= 0.3
+
+
+def test_anthropic_retries_overloaded(fake_server):
+    fake_server.script = [(529, {"retry-after": "0.2"}), (503, {})]
+
+    result = AnthropicProvider("claude-test").process_text("Some text.", "summary")
+
+    assert result == "answer from claude-test"
+    assert len(fake_server.requests) == 3
+
+
+@pytest.mark.parametrize(
+    "provider_class, model",
+    [(OpenAIProvider, "gpt-4o"), (AnthropicProvider, "claude-test")],
+)
+def test_persistent_429_raises_rate_limit_error(fake_server, provider_class, model):
+    fake_server.script = [(429, {"retry-after-ms": "10"})] * 3
+
+    with pytest.raises(RateLimitError):
+        provider_class(model).process_text("Some text.", "summary")
+    assert len(fake_server.requests) == 3
+
+
+def test_client_error_is_wrapped_with_cause(fake_server):
+    fake_server.script = [(400, {})]
+
+    with pytest.raises(ProcessedTextError) as excinfo:
+        OpenAIProvider("gpt-4o").process_text("Some text.", "summary")
+
+    assert isinstance(excinfo.value.__cause__, openai.BadRequestError)
+    assert len(fake_server.requests) == 1
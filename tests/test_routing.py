@@ -0,0 +1,127 @@
+import threading
+import time
+from typing import Optional
+
+import pytest
+
+from read_audio.errors import ProcessedTextError
+from read_audio.providers import AIProvider, RoutingProvider
+
+
+class FakeProvider(AIProvider):
+    """Answers with its name after `delay` seconds, or raises if `fail` is set."""
+
+    def __init__(self, name: str, delay: float = 0.0, fail: bool = False):
+        self.name = name
+        self.model = f"{name}-model"
+        self.delay = delay
+        self.fail = fail
+        self.calls: list[float] = []
+        self.release = threading.Event()
+
+    def process_text(
+        self,
+        text: str,
+        mode: str,
+        prompt: Optional[str] = None,
+        max_tokens: Optional[int] = None,
+        context_size: Optional[int] = None,
+    ) -> str:
+        self.calls.append(time.monotonic())
+        # Slow calls end early once the test is over
+        self.release.wait(self.delay)
+        if self.fail:
+            raise ProcessedTextError(f"{self.name} failed")
+        return self.name
+
+    def summarize(self, text: str) -> str:
+        return self.process_text(text, "summary")
+
+    def condense(self, text: str) -> str:
+        return self.process_text(text, "condense")
+
+
+@pytest.fixture
+def backends():
+    created: list[FakeProvider] = []
+
+    def make(*providers: FakeProvider) -> dict[str, FakeProvider]:
+        created.extend(providers)
+        return {provider.name: provider for provider in providers}
+
+    yield make
+    for provider in created:
+        provider.release.set()
+
+
+def test_fast_primary_stays_ahead_of_untried_fallback(backends):
+    router = RoutingProvider(
+        backends(FakeProvider("a", delay=0.05), FakeProvider("b")), hedge_delay=0.2
+    )
+
+    assert router.process_text("text", "summary") == "a"
+    assert router.ranked() == ["a", "b"]
+
+
+def test_slow_primary_falls_behind_untried_fallback(backends):
+    router = RoutingProvider(
+        backends(FakeProvider("a"), FakeProvider("b")), hedge_delay=0.2
+    )
+    router.histograms["a"].record(0.5)
+
+    assert router.ranked() == ["b", "a"]
+
+
+def test_failing_backend_ranks_last(backends):
+    router = RoutingProvider(
+        backends(FakeProvider("a", fail=True), FakeProvider("b"), FakeProvider("c")),
+        hedge_delay=10,
+    )
+
+    assert router.process_text("text", "summary") == "b"
+    assert router.ranked() == ["b", "c", "a"]
+
+
+def test_hedges_after_delay(backends):
+    slow, fast = FakeProvider("a", delay=5), FakeProvider("b")
+    router = RoutingProvider(backends(slow, fast), hedge_delay=0.2)
+
+    start = time.monotonic()
+    assert router.process_text("text", "summary") == "b"
+
+    assert fast.calls[0] - slow.calls[0] >= 0.2
+    assert time.monotonic() - start < 1
+
+
+def test_fails_over_immediately_on_error(backends):
+    failing, fallback = FakeProvider("a", fail=True), FakeProvider("b")
+    router = RoutingProvider(backends(failing, fallback), hedge_delay=10)
+
+    start = time.monotonic()
+    assert router.process_text("text", "summary") == "b"
+
+    assert time.monotonic() - start < 1
+    assert router.histograms["a"].failures == 1
+
+
+def test_raises_when_deadline_passes(backends):
+    router = RoutingProvider(
+        backends(FakeProvider("a", delay=5), FakeProvider("b", delay=5)),
+        deadline=0.3,
+        hedge_delay=0.1,
+    )
+
+    start = time.monotonic()
+    with pytest.raises(ProcessedTextError, match="within 0.3s"):
+        router.process_text("text", "summary")
+    assert time.monotonic() - start < 1
+
+
+def test_raises_when_all_backends_fail(backends):
+    router = RoutingProvider(
+        backends(FakeProvider("a", fail=True), FakeProvider("b", fail=True)),
+        hedge_delay=10,
+    )
+
+    with pytest.raises(ProcessedTextError, match="All backends failed"):
+        router.process_text("text", "summary")
@@ -0,0 +1,138 @@
+import threading
+import time
+
+import openai
+import pytest
+
+from read_audio import scheduler as scheduler_module
+from read_audio.errors import RateLimitError
+from read_audio.scheduler import RequestScheduler, priority
+
+
+def make_scheduler(**limits) -> RequestScheduler:
+    return RequestScheduler(
+        limits={"fake": limits or {"rpm": None, "tpm": None}},
+        max_retries=3,
+        base_delay=0.05,
+        max_delay=0.2,
+    )
+
+
+def test_honors_retry_after(fake_server):
+    fake_server.script = [(429, {"Retry-After": "0.3"}), (429, {"Retry-After": "0.3"})]
+    scheduler = make_scheduler()
+
+    start = time.monotonic()
+    assert scheduler.call("fake", "m", fake_server.request) == "answer from m"
+
+    assert len(fake_server.requests) == 3
+    assert time.monotonic() - start >= 0.6
+
+
+def test_honors_retry_after_ms(fake_server, monkeypatch):
+    fake_server.script = [(429, {"retry-after-ms": "300", "Retry-After": "30"})]
+    monkeypatch.setattr(
+        scheduler_module.random, "uniform", lambda low, high: pytest.fail("backed off")
+    )
+
+    start = time.monotonic()
+    make_scheduler().call("fake", "m", fake_server.request)
+
+    assert 0.3 <= time.monotonic() - start < 5
+
+
+def test_backs_off_exponentially_without_retry_after(fake_server, monkeypatch):
+    fake_server.script = [(503, {}), (503, {}), (503, {})]
+    delays = []
+    monkeypatch.setattr(
+        scheduler_module.random, "uniform", lambda low, high: delays.append(high) or 0
+    )
+
+    make_scheduler().call("fake", "m", fake_server.request)
+
+    assert delays == [0.05, 0.1, 0.2]
+    assert len(fake_server.requests) == 4
+
+
+def test_raises_rate_limit_error_after_retries(fake_server):
+    fake_server.script = [(429, {"Retry-After": "0"})] * 4
+
+    with pytest.raises(RateLimitError):
+        make_scheduler().call("fake", "m", fake_server.request)
+    assert len(fake_server.requests) == 4
+
+
+def test_does_not_retry_client_errors(fake_server):
+    fake_server.script = [(400, {})]
+
+    with pytest.raises(openai.BadRequestError):
+        make_scheduler().call("fake", "m", fake_server.request)
+    assert len(fake_server.requests) == 1
+
+
+def test_retries_connection_errors():
+    class APIConnectionError(Exception):
+        pass
+
+    attempts = []
+
+    def flaky() -> str:
+        attempts.append(1)
+        if len(attempts) < 3:
+            raise APIConnectionError("connection reset")
+        return "ok"
+
+    assert make_scheduler().call("fake", "m", flaky) == "ok"
+    assert len(attempts) == 3
+
+
+def test_429_holds_back_other_callers(fake_server):
+    fake_server.script = [(429, {"Retry-After": "0.5"})]
+    scheduler = make_scheduler()
+
+    first = threading.Thread(
+        target=scheduler.call, args=("fake", "m", fake_server.request)
+    )
+    first.start()
+    time.sleep(0.1)
+    scheduler.call("fake", "m", fake_server.request)
+    first.join()
+
+    rejected_at = fake_server.requests[0][1]
+    assert len(fake_server.requests) == 3
+    assert all(t - rejected_at >= 0.45 for _, t in fake_server.requests[1:])
+
+
+def test_grants_requests_in_priority_order(fake_server):
+    # Space grants 0.1s apart so the server sees them in the order they were granted
+    scheduler = make_scheduler(rpm=600)
+    limiter = scheduler.limiter("fake", "m")
+    limiter.requests.capacity = 1
+    limiter.requests.available = 0
+    limiter.block_for(0.5)
+
+    def call(value: int) -> None:
+        with priority(value):
+            scheduler.call("fake", "m", lambda: fake_server.request(f"m{value}"))
+
+    threads = [threading.Thread(target=call, args=(value,)) for value in (5, 1, 3)]
+    for thread in threads:
+        thread.start()
+        time.sleep(0.05)
+    for thread in threads:
+        thread.join()
+
+    assert [model for model, _ in fake_server.requests] == ["m1", "m3", "m5"]
+
+
+def test_requests_per_minute_limit(fake_server):
+    scheduler = make_scheduler(rpm=600)  # One request every 0.1s
+    limiter = scheduler.limiter("fake", "m")
+    limiter.requests.capacity = 1
+    limiter.requests.available = 0
+
+    start = time.monotonic()
+    for _ in range(3):
+        scheduler.call("fake", "m", fake_server.request)
+
+    assert time.monotonic() - start >= 0.25
@@ -0,0 +1,149 @@
+import http.client
+import json
+import threading
+from http.server import ThreadingHTTPServer
+from typing import Optional
+
+import pytest
+
+from read_audio.errors import JobValidationError, ProcessedTextError
+from read_audio.providers import AIProvider
+from read_audio.server import JobManager, JobRequestHandler
+
+
+class SummaryOnlyProvider(AIProvider):
+    """Summarizes, but fails every condense request."""
+
+    model = "llama3.1:8b"
+
+    def process_text(
+        self,
+        text: str,
+        mode: str,
+        prompt: Optional[str] = None,
+        max_tokens: Optional[int] = None,
+        context_size: Optional[int] = None,
+    ) -> str:
+        if mode == "condense":
+            raise ProcessedTextError("condense failed")
+        return "A summary."
+
+    def summarize(self, text: str) -> str:
+        return self.process_text(text, "summary")
+
+    def condense(self, text: str) -> str:
+        return self.process_text(text, "condense")
+
+
+@pytest.fixture
+def manager(tmp_path):
+    return JobManager(output=tmp_path)
+
+
+@pytest.fixture
+def server(manager):
+    handler = type("Handler", (JobRequestHandler,), {"manager": manager})
+    httpd = ThreadingHTTPServer(("127.0.0.1", 0), handler)
+    thread = threading.Thread(target=httpd.serve_forever, daemon=True)
+    thread.start()
+    yield httpd
+    httpd.shutdown()
+    httpd.server_close()
+
+
+def get(server, path: str) -> tuple[int, dict]:
+    connection = http.client.HTTPConnection(*server.server_address, timeout=5)
+    connection.request("GET", path)
+    response = connection.getresponse()
+    return response.status, json.loads(response.read())
+
+
+def post(server, body: bytes, headers: dict[str, str]) -> tuple[int, dict]:
+    connection = http.client.HTTPConnection(*server.server_address, timeout=5)
+    connection.putrequest("POST", "/jobs")
+    for name, value in headers.items():
+        connection.putheader(name, value)
+    connection.endheaders(body)
+    response = connection.getresponse()
+    return response.status, json.loads(response.read())
+
+
+@pytest.mark.parametrize(
+    "spec",
+    [
+        {"transcript": 5},
+        {"url": ["https://example.com"]},
+        {"url": "https://example.com", "modes": [["summary"]]},
+        {"url": "https://example.com", "modes": ["translate"]},
+        {"url": "https://example.com", "fallback_providers": [{}]},
+        {"url": "https://example.com", "provider": ["openai"]},
+        {"url": "https://example.com", "model": 3},
+        {"url": "https://example.com", "condense_percentages": [True]},
+        {"url": "https://example.com", "priority": "high"},
+        {"url": "https://example.com", "incremental": "yes"},
+        {"url": "https://example.com", "bogus": 1},
+        {"transcript": "/does/not/exist.txt"},
+        {},
+    ],
+)
+def test_rejects_malformed_specs(manager, spec):
+    with pytest.raises(JobValidationError):
+        manager._validate(spec)
+
+
+def test_accepts_valid_spec(manager, tmp_path):
+    transcript = tmp_path / "talk_transcript.txt"
+    transcript.write_text("Hello.")
+
+    options = manager._validate(
+        {
+            "transcript": str(transcript),
+            "modes": ["summary", "condense"],
+            "fallback_providers": ["openai"],
+            "condense_percentages": [10, 30],
+        }
+    )
+
+    assert options["transcript"] == transcript
+    assert options["fallback_providers"] == ["openai"]
+
+
+@pytest.mark.parametrize(
+    "body, headers",
+    [
+        (b'{"transcript": 5}', {}),
+        (b'{"url": "x", "fallback_providers": [{}]}', {}),
+        (b"not json", {}),
+        (b"[]", {}),
+        (b"\xff\xfe", {}),
+        (b"{}", {"Content-Length": "abc"}),
+        (b"{}", {"Content-Length": "-1"}),
+    ],
+)
+def test_post_answers_bad_request(server, body, headers):
+    headers = {"Content-Length": str(len(body)), **headers}
+
+    status, response = post(server, body, headers)
+
+    assert status == 400
+    assert "error" in response
+
+
+def test_partial_job_keeps_written_outputs(manager, server, tmp_path):
+    transcript = tmp_path / "talk_transcript.txt"
+    transcript.write_text("Hello there. This is a talk.")
+    manager._providers[("ollama", "llama3.1:8b", ())] = SummaryOnlyProvider()
+
+    job = manager.submit(
+        {"transcript": str(transcript), "modes": ["summary", "condense"]}
+    )
+    manager._run(job)
+
+    assert job.status == "partial"
+    assert [path.name for path in job.output_files] == ["talk_transcript_summary.txt"]
+    assert "condense failed" in job.output_errors["condensed"]
+
+    status, body = get(server, f"/jobs/{job.id}/result")
+    assert status == 200
+    assert body["results"][0]["result"] == "A summary."
+    assert "condensed" in body["output_errors"]